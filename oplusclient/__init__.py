@@ -1,2 +1,5 @@
 from .client import Client
+from .aio import AsyncClient
+from .retry import RetryPolicy
+from .rest_client import create_session
 from .version import version as __version__
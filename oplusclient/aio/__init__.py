@@ -0,0 +1,5 @@
+from .client import AsyncClient
+from .rest_client import AsyncRestClient
+from .endpoints import AsyncBaseEndpoint, AsyncSimulationEndpoint
+from .record import AsyncRecord
+from .task import AsyncTask
@@ -0,0 +1,150 @@
+from ..rest_client import DEFAULT_TIMEOUT, DEFAULT_TOKEN_REFRESH_MARGIN
+from .rest_client import AsyncRestClient, DEFAULT_CONNECTION_LIMIT
+from .endpoints import AsyncBaseEndpoint, AsyncSimulationEndpoint
+from .task import AsyncTask
+
+
+class AsyncClient:
+    def __init__(
+            self,
+            api_token=None,
+            base_url=None,
+            retry_policy=None,
+            session=None,
+            connection_limit=DEFAULT_CONNECTION_LIMIT,
+            timeout=DEFAULT_TIMEOUT,
+            token_refresh_margin=DEFAULT_TOKEN_REFRESH_MARGIN
+    ):
+        """
+        Asyncio client, requires aiohttp (pip install oplusclient[async]).
+
+        Endpoints are the same as Client's, their methods are coroutines. Records only hold data: actions are performed
+        with the endpoints coroutines (detail_action, update, delete, download, upload).
+
+        Parameters
+        ----------
+        api_token
+        base_url: default https://oplus-back.openergy.fr/api/v1
+        retry_policy: oplusclient.RetryPolicy or None
+            policy used to retry failed requests (server errors, throttling, connection errors), default RetryPolicy()
+        session: aiohttp.ClientSession or None
+            session shared with other clients, if None a new one is created
+        connection_limit: int
+            maximum number of simultaneous connections (ignored if session is given)
+        timeout: float or tuple or None
+            (connect, read) timeouts in seconds
+        token_refresh_margin: float
+            number of seconds before its expiry at which the access token is refreshed
+
+        Examples
+        --------
+        >>> async with AsyncClient(api_token) as client:
+        ...     async for weather in client.weather.iter(filter_by=dict(project=project_id)):
+        ...         print(weather.name)
+        """
+        self.rest_client: AsyncRestClient = AsyncRestClient(
+            api_token=api_token,
+            base_url=base_url,
+            retry_policy=retry_policy,
+            session=session,
+            connection_limit=connection_limit,
+            timeout=timeout,
+            token_refresh_margin=token_refresh_margin
+        )
+
+        # geometry
+        self.geometry = AsyncBaseEndpoint(self, "ossgeometry/geometries")
+        self.floorspace = AsyncBaseEndpoint(self, "ossgeometry/floorspaces")
+
+        # obat
+        self.obat = AsyncBaseEndpoint(self, "ossbat/obats")
+
+        # weather
+        self.weather = AsyncBaseEndpoint(self, "ossweather/weathers")
+        self.generic_weather_series = AsyncBaseEndpoint(self, "ossweather/generic_weather_series")
+        self.historical_weather_series = AsyncBaseEndpoint(self, "ossweather/historical_weather_series")
+        self.openergy_historical_weather_series = AsyncBaseEndpoint(
+            self,
+            "ossweather/openergy_historical_weather_series"
+        )
+
+        # simulations
+        self.simulation_group = AsyncBaseEndpoint(self, "osssimulations/simulation_groups")
+        self.multi_simulation_group = AsyncBaseEndpoint(self, "osssimulations/multi_simulation_groups")
+        self.mono_simulation_group = AsyncBaseEndpoint(self, "osssimulations/mono_simulation_groups")
+        self.generic_simulation_group = AsyncBaseEndpoint(self, "osssimulations/generic_simulation_groups")
+
+        # oteams
+        self.user = AsyncBaseEndpoint(self, "oteams/users")
+        self.organization = AsyncBaseEndpoint(self, "oteams/organizations")
+        self.project = AsyncBaseEndpoint(self, "oteams/projects")
+        self.user_organization_permission = AsyncBaseEndpoint(self, "oteams/user_organization_permissions")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
+        await self.rest_client.close()
+
+    def get_simulation_endpoint(self, simulation_group):
+        """
+        Get the endpoint of the simulations of a simulation group.
+
+        Parameters
+        ----------
+        simulation_group: oplusclient.aio.AsyncRecord
+            simulation group record, as returned by one of the simulation group endpoints
+
+        Returns
+        -------
+        oplusclient.aio.AsyncSimulationEndpoint
+        """
+        return AsyncSimulationEndpoint(self, simulation_group)
+
+    def get_task(self, task_id):
+        """
+        Parameters
+        ----------
+        task_id: str
+            user task id, as returned by import, export or run detail actions
+
+        Returns
+        -------
+        oplusclient.aio.AsyncTask
+        """
+        return AsyncTask(task_id, self.rest_client)
+
+    async def get_organization(self, name):
+        """
+        Get organization by name.
+
+        Parameters
+        ----------
+        name: str
+
+        Returns
+        -------
+        oplusclient.aio.AsyncRecord
+        """
+        return await self.organization.get_one_and_only_one(filter_by=dict(name=name))
+
+    async def get_project(self, organization_name, project_name):
+        """
+        Get project by organization and name.
+
+        Parameters
+        ----------
+        organization_name: str
+        project_name: str
+
+        Returns
+        -------
+        oplusclient.aio.AsyncRecord
+        """
+        organization = await self.get_organization(organization_name)
+        return await self.project.get_one_and_only_one(
+            filter_by=dict(organization=organization.id, name=project_name)
+        )
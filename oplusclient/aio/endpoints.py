@@ -0,0 +1,341 @@
+import asyncio
+import collections
+
+from ..endpoints.base import BaseEndpoint, DEFAULT_LIST_LIMIT
+from ..models.base import _get_projection
+from ..util import get_id
+from .record import AsyncRecord
+
+
+def _get_id(record_or_dict_or_id):
+    if isinstance(record_or_dict_or_id, AsyncRecord):
+        return record_or_dict_or_id.id
+    return get_id(record_or_dict_or_id)
+
+
+class AsyncBaseEndpoint:
+    """
+    Records returned by async endpoints only hold data: use the endpoint coroutines to act on them.
+    """
+    MAX_ITERATIONS = BaseEndpoint.MAX_ITERATIONS
+
+    def __init__(
+            self,
+            client,
+            route
+    ):
+        self.route = route
+        self.client = client
+
+    def data_to_record(self, data):
+        return AsyncRecord(self, data)
+
+    async def _list_data(
+            self,
+            filter_by=None,
+            limit=DEFAULT_LIST_LIMIT,
+            offset=0,
+            extra_params=None,
+            fields=None,
+            exclude=None
+    ):
+        params = dict()
+        if filter_by is not None:
+            params.update(filter_by)
+        if extra_params is not None:
+            params.update(extra_params)
+        if limit > 0:
+            params["length"] = limit
+        if offset > 0:
+            params["start"] = offset
+        return (await self.client.rest_client.list(
+            self.route,
+            params=params,
+            **_get_projection(fields, exclude)
+        ))["data"]
+
+    async def list(
+            self,
+            filter_by=None,
+            limit=DEFAULT_LIST_LIMIT,
+            offset=0,
+            extra_params=None,
+            fields=None,
+            exclude=None
+    ):
+        records_data = await self._list_data(
+            filter_by=filter_by,
+            limit=limit,
+            offset=offset,
+            extra_params=extra_params,
+            fields=fields,
+            exclude=exclude
+        )
+        return [self.data_to_record(data) for data in records_data]
+
+    async def _iter_pages_data(
+            self,
+            filter_by=None,
+            extra_params=None,
+            page_size=DEFAULT_LIST_LIMIT,
+            prefetch=0,
+            fields=None,
+            exclude=None
+    ):
+        if page_size <= 0:
+            raise ValueError(f"page_size must be strictly positive, got {page_size}")
+
+        # set as soon as a short (last) page is received, so that no page past it is requested anymore
+        last_page_received = asyncio.Event()
+
+        async def list_page(page_index):
+            records_data = await self._list_data(
+                filter_by=filter_by,
+                limit=page_size,
+                offset=page_index * page_size,
+                extra_params=extra_params,
+                fields=fields,
+                exclude=exclude
+            )
+            if len(records_data) < page_size:
+                last_page_received.set()
+            return records_data
+
+        if prefetch <= 0:
+            for i in range(self.MAX_ITERATIONS):
+                records_data = await list_page(i)
+                yield records_data
+                if len(records_data) < page_size:
+                    break
+            else:
+                raise RuntimeError(f"maximum iteration was reached ({self.MAX_ITERATIONS}), stopping")
+            return
+
+        # offset paging: next pages can be requested before the current one is consumed
+        pending = collections.deque()
+        try:
+            next_page_index = 0
+            while True:
+                while len(pending) <= prefetch and not last_page_received.is_set():
+                    pending.append(asyncio.ensure_future(list_page(next_page_index)))
+                    next_page_index += 1
+                records_data = await pending.popleft()
+                yield records_data
+                if len(records_data) < page_size:
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def iter(
+            self,
+            filter_by=None,
+            extra_params=None,
+            page_size=DEFAULT_LIST_LIMIT,
+            prefetch=0,
+            fields=None,
+            exclude=None
+    ):
+        """
+        Iterate through records, page by page (same paging as oplusclient.endpoints.BaseEndpoint.iter).
+
+        Parameters
+        ----------
+        filter_by: dict or None
+        extra_params: dict or None
+        page_size: int
+            number of records per page
+        prefetch: int
+            number of pages requested concurrently while the current page is being consumed. If 0, pages are requested
+            one after another and iteration stops after MAX_ITERATIONS pages, else iteration is not limited.
+        fields: list of str or None
+            only request these fields (and id)
+        exclude: list of str or None
+            do not request these fields
+        """
+        pages = self._iter_pages_data(
+            filter_by=filter_by,
+            extra_params=extra_params,
+            page_size=page_size,
+            prefetch=prefetch,
+            fields=fields,
+            exclude=exclude
+        )
+        try:
+            async for records_data in pages:
+                for data in records_data:
+                    yield self.data_to_record(data)
+        finally:
+            # pending pages are cancelled when iteration is stopped early
+            await pages.aclose()
+
+    async def get_one_and_only_one(self, filter_by=None):
+        params = dict()
+        if filter_by is not None:
+            params.update(filter_by)
+        record_data = await self.client.rest_client.get_one_and_only_one(self.route, params)
+        return self.data_to_record(record_data)
+
+    async def create(self, **data):
+        rep_data = await self.client.rest_client.create(self.route, data)
+        return self.data_to_record(rep_data)
+
+    async def retrieve(self, record_id, params=None, fields=None, exclude=None):
+        rep_data = await self.client.rest_client.retrieve(
+            self.route,
+            record_id,
+            params=params,
+            **_get_projection(fields, exclude)
+        )
+        return self.data_to_record(rep_data)
+
+    async def update(self, record, **data):
+        """
+        Parameters
+        ----------
+        record: AsyncRecord or str
+            record or record id
+        data: fields to update
+
+        Returns
+        -------
+        AsyncRecord
+        """
+        rep_data = await self.client.rest_client.partial_update(self.route, _get_id(record), data)
+        return self.data_to_record(rep_data)
+
+    async def delete(self, record):
+        await self.client.rest_client.delete(self.route, _get_id(record))
+
+    async def detail_action(self, record, action_name, method="get", data=None, params=None):
+        return await self.client.rest_client.detail_action(
+            self.route,
+            _get_id(record),
+            action_name,
+            method=method,
+            data=data,
+            params=params
+        )
+
+    async def download(self, record, buffer_or_path=None, path="blob_url"):
+        """
+        Parameters
+        ----------
+        record: AsyncRecord or str
+            record or record id
+        buffer_or_path: buffer or path where to write the content (if None, returns bytes)
+        path: str
+            detail route giving the blob url
+
+        Returns
+        -------
+        bytes or int
+        """
+        download_url = (await self.detail_action(record, path))["blob_url"]
+        return await self.client.rest_client.download(download_url, buffer_or_path=buffer_or_path)
+
+    async def upload(self, record, buffer_or_path, path="upload_url"):
+        """
+        Parameters
+        ----------
+        record: AsyncRecord or str
+            record or record id
+        buffer_or_path: buffer or path of the content to upload
+        path: str
+            detail route giving the blob url
+        """
+        upload_url = (await self.detail_action(record, path))["blob_url"]
+        await self.client.rest_client.upload(upload_url, buffer_or_path)
+
+
+class AsyncSimulationEndpoint:
+    def __init__(
+            self,
+            client,
+            simulation_group
+    ):
+        self.parent = simulation_group
+        self.route = f"{self.parent.endpoint.route}/{self.parent.id}/simulations"
+        self.client = client
+
+    def data_to_record(self, data):
+        return AsyncRecord(self, data)
+
+    async def list(self, filter_by_status=None, next_marker=None, fields=None, exclude=None):
+        """
+        List simulations.
+
+        Parameters
+        ----------
+        filter_by_status: str or None
+        next_marker: str
+        fields: list of str or None
+            only request these fields and id (records are not completed on access, unlike synchronous records)
+        exclude: list of str or None
+            do not request these fields
+
+        Returns
+        -------
+        list of oplusclient.aio.AsyncRecord
+        str
+        """
+        data = await self.client.rest_client.list(
+            self.route,
+            params=dict(status=filter_by_status, next_marker=next_marker),
+            **_get_projection(fields, exclude)
+        )
+        records_data = data["data"]
+        next_marker = data.get("next_marker")
+        return [self.data_to_record(data) for data in records_data], next_marker
+
+    async def iter(self, filter_by_status=None, fields=None, exclude=None):
+        next_marker = None
+        while True:
+            candidates, next_marker = await self.list(
+                filter_by_status=filter_by_status,
+                next_marker=next_marker,
+                fields=fields,
+                exclude=exclude
+            )
+            for c in candidates:
+                yield c
+            if next_marker is None:
+                break
+
+    async def retrieve(self, record_id, params=None, fields=None, exclude=None):
+        rep_data = await self.client.rest_client.retrieve(
+            self.route,
+            record_id,
+            params=params,
+            **_get_projection(fields, exclude)
+        )
+        return self.data_to_record(rep_data)
+
+    async def detail_action(self, record, action_name, method="get", data=None, params=None):
+        return await self.client.rest_client.detail_action(
+            self.route,
+            _get_id(record),
+            action_name,
+            method=method,
+            data=data,
+            params=params
+        )
+
+    async def download(self, record, action_name, buffer_or_path=None):
+        """
+        Download a simulation output.
+
+        Parameters
+        ----------
+        record: AsyncRecord or str
+            simulation or simulation id
+        action_name: str
+            detail route giving the blob url (out_monthly_consumption, eplus_output, ...)
+        buffer_or_path: buffer or path where to write the content (if None, returns bytes)
+
+        Returns
+        -------
+        bytes or int
+        """
+        download_url = (await self.detail_action(record, action_name))["blob_url"]
+        return await self.client.rest_client.download(download_url, buffer_or_path=buffer_or_path)
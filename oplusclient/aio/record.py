@@ -0,0 +1,28 @@
+class AsyncRecord:
+    def __init__(self, endpoint, data):
+        """
+        Record returned by async endpoints. It only holds data: actions are performed with the endpoint coroutines
+        (update, delete, detail_action, download, upload), and fields that were not requested are not loaded on access.
+
+        Parameters
+        ----------
+        endpoint: oplusclient.aio.AsyncBaseEndpoint or oplusclient.aio.AsyncSimulationEndpoint
+        data: dict
+        """
+        self.endpoint = endpoint
+        self.data = data
+
+    def __getattr__(self, item):
+        # data is looked up in __dict__ so that copies and unpickling (no __init__ call) do not recurse
+        data = self.__dict__.get("data")
+        if data is None or item not in data:
+            raise AttributeError(f"{item} not found")
+        return data[item]
+
+    def __repr__(self):
+        msg = f"<{self.__class__.__name__}: "
+        if "name" in self.data:
+            msg += f"{self.data['name']} ({self.data.get('id')})>"
+        else:
+            msg += f"{self.data.get('id')}>"
+        return msg
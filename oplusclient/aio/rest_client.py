@@ -0,0 +1,326 @@
+from getpass import getpass
+import os
+import json
+import asyncio
+import logging
+import datetime as dt
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from ..exceptions import InvalidToken
+from ..retry import RetryPolicy
+from ..rest_client import (
+    _JWTAuth, _get_one_and_only_one, _get_projection_params, _raise_for_status_code, _get_block_id,
+    _get_block_list_body, _read_block,
+    DEFAULT_MAX_WORKERS, DEFAULT_TIMEOUT, DEFAULT_TOKEN_REFRESH_MARGIN, DOWNLOAD_CHUNK_SIZE, UPLOAD_BLOCK_SIZE
+)
+
+logger = logging.getLogger(__name__)
+
+# maximum number of simultaneous connections
+DEFAULT_CONNECTION_LIMIT = 100
+
+
+class AsyncRestClient:
+    def __init__(
+            self,
+            api_token=None,
+            base_url=None,
+            retry_policy=None,
+            session=None,
+            connection_limit=DEFAULT_CONNECTION_LIMIT,
+            timeout=DEFAULT_TIMEOUT,
+            token_refresh_margin=DEFAULT_TOKEN_REFRESH_MARGIN
+    ):
+        """
+        Parameters
+        ----------
+        api_token
+        base_url: default https://oplus-back.openergy.fr/api/v1
+        retry_policy: oplusclient.RetryPolicy or None
+            policy used to retry failed requests, default RetryPolicy()
+        session: aiohttp.ClientSession or None
+            session to use, allows to share connections between clients. If None, a new session is created on first
+            request (and closed with the client).
+        connection_limit: int
+            maximum number of simultaneous connections (ignored if session is given)
+        timeout: float or tuple or None
+            (connect, read) timeouts in seconds
+        token_refresh_margin: float
+            number of seconds before its expiry at which the access token is refreshed
+        """
+        if aiohttp is None:
+            raise ImportError("aiohttp is required by the async client: pip install oplusclient[async]")
+        if base_url is None:
+            base_url = "https://oplus-back.openergy.fr/api/v1"
+        self.base_url = base_url[:-1] if base_url.endswith("/") else base_url
+        self.retry_policy = RetryPolicy() if retry_policy is None else retry_policy
+        self.timeout = timeout
+        self.connection_limit = connection_limit
+        self._owns_session = session is None
+        self._session = session
+        self._auth = _AsyncJWTAuth(
+            api_token if api_token is not None else getpass("Api token: "),
+            self.base_url,
+            self,
+            refresh_margin=token_refresh_margin
+        )
+
+    @property
+    def retry_count(self):
+        """
+        Number of retries performed by the retry policy.
+        """
+        return self.retry_policy.retry_count
+
+    def _get_session(self):
+        # session is created lazily, since it must be created in a running event loop
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.connection_limit),
+                timeout=_get_client_timeout(self.timeout)
+            )
+        return self._session
+
+    async def close(self):
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+
+    async def _request(self, method, url, authenticate=True, **kwargs):
+        """
+        Sends a request, retrying it on connection errors and retryable responses according to the retry policy.
+        Response must be released by the caller.
+        """
+        if kwargs.get("params") is not None:
+            kwargs["params"] = _get_query_params(kwargs["params"])
+        headers = kwargs.pop("headers", None) or dict()
+        session = self._get_session()
+        attempt = 0
+        while True:
+            attempt += 1
+            # no authentication for blobs
+            if authenticate and "blob.core.windows.net" not in url:
+                headers["Authorization"] = f"Bearer {await self._auth.get_access_token()}"
+            try:
+                response = await session.request(method, url, headers=headers, **kwargs)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if not self.retry_policy.can_retry(method, attempt):
+                    raise
+                self.retry_policy.register_retry(method, url, e)
+                await asyncio.sleep(self.retry_policy.get_delay(attempt))
+                continue
+            if not (
+                    self.retry_policy.is_retryable_status(response.status) and
+                    self.retry_policy.can_retry(method, attempt)
+            ):
+                return response
+            self.retry_policy.register_retry(method, url, response.status)
+            response.release()
+            await asyncio.sleep(self.retry_policy.get_delay(attempt, response.headers))
+
+    async def _request_json(self, method, url, **kwargs):
+        response = await self._request(method, url, **kwargs)
+        async with response:
+            text = await response.text()
+        _raise_for_status_code(response.status, text)
+        return json.loads(text) if text else None
+
+    async def list(self, path, params=None, fields=None, exclude=None):
+        return await self._request_json(
+            "get",
+            f"{self.base_url}/{path}",
+            params=_get_projection_params(params, fields, exclude)
+        )
+
+    async def create(self, path, data):
+        return await self._request_json("post", f"{self.base_url}/{path}", json=data)
+
+    async def retrieve(self, path, record_id, params=None, fields=None, exclude=None):
+        return await self._request_json(
+            "get",
+            f"{self.base_url}/{path}/{record_id}",
+            params=_get_projection_params(params, fields, exclude)
+        )
+
+    async def get_one_and_only_one(self, path, params=None):
+        return _get_one_and_only_one((await self.list(path, params=params))["data"])
+
+    async def update(self, path, record_id, data):
+        return await self._request_json("put", f"{self.base_url}/{path}/{record_id}", json=data)
+
+    async def partial_update(self, path, record_id, data):
+        return await self._request_json("patch", f"{self.base_url}/{path}/{record_id}", json=data)
+
+    async def delete(self, path, resource_id):
+        await self._request_json("delete", f"{self.base_url}/{path}/{resource_id}")
+
+    async def detail_action(self, path, record_id, action_name, method="get", data=None, params=None):
+        return await self._request_json(
+            method,
+            f"{self.base_url}/{path}/{record_id}/{action_name}",
+            json=data,
+            params=params
+        )
+
+    async def download(self, download_url, buffer_or_path=None, chunk_size=DOWNLOAD_CHUNK_SIZE):
+        """
+        Parameters
+        ----------
+        download_url: str
+        buffer_or_path: buffer or path where to write the content chunk by chunk (if None, returns bytes)
+        chunk_size: int
+            size (in bytes) of the written chunks
+
+        Returns
+        -------
+        bytes or int
+            content if buffer_or_path is None, else number of bytes transferred
+        """
+        response = await self._request("get", download_url)
+        async with response:
+            if response.status >= 400:
+                _raise_for_status_code(response.status, await response.text())
+            if buffer_or_path is None:
+                return await response.read()
+            if hasattr(buffer_or_path, "write"):
+                transferred = await _write_content(response, buffer_or_path, chunk_size)
+            else:
+                with open(buffer_or_path, "wb") as f:
+                    transferred = await _write_content(response, f, chunk_size)
+        logger.debug(f"downloaded {transferred} bytes")
+        return transferred
+
+    async def upload(
+            self,
+            upload_url,
+            buffer_or_path,
+            block_size=UPLOAD_BLOCK_SIZE,
+            max_concurrency=DEFAULT_MAX_WORKERS
+    ):
+        """
+        Upload a buffer or file to a blob.
+
+        Content is read block by block. If it is bigger than block_size, blocks are uploaded concurrently (each one
+        being retried on its own) then committed, else content is uploaded with a single request.
+
+        Parameters
+        ----------
+        upload_url: str
+        buffer_or_path: buffer or path of the content to upload
+        block_size: int
+            size (in bytes) of uploaded blocks
+        max_concurrency: int
+            maximum number of blocks uploaded (and held in memory) at the same time
+        """
+        if hasattr(buffer_or_path, "read"):
+            await self._upload_buffer(upload_url, buffer_or_path, block_size, max_concurrency)
+        else:
+            with open(os.path.realpath(buffer_or_path), "rb") as f:
+                await self._upload_buffer(upload_url, f, block_size, max_concurrency)
+
+    async def _upload_buffer(self, upload_url, buffer, block_size, max_concurrency):
+        block = _read_block(buffer, block_size)
+        next_block = _read_block(buffer, block_size)
+        if len(next_block) == 0:
+            await self._request_json("put", upload_url, data=block, headers={"x-ms-blob-type": "BlockBlob"})
+            return
+
+        block_ids = []
+        pending = set()
+        try:
+            while len(block) > 0:
+                # limit the number of blocks in memory
+                if len(pending) >= max_concurrency:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+                block_id = _get_block_id(len(block_ids))
+                block_ids.append(block_id)
+                pending.add(asyncio.ensure_future(self._request_json(
+                    "put",
+                    upload_url,
+                    data=block,
+                    params=dict(comp="block", blockid=block_id)
+                )))
+                block, next_block = next_block, _read_block(buffer, block_size)
+            if len(pending) > 0:
+                await asyncio.gather(*pending)
+        except BaseException:
+            for future in pending:
+                future.cancel()
+            raise
+
+        await self._request_json("put", upload_url, data=_get_block_list_body(block_ids), params=dict(comp="blocklist"))
+
+
+class _AsyncJWTAuth:
+    def __init__(self, refresh_token, base_url, rest_client, refresh_margin=DEFAULT_TOKEN_REFRESH_MARGIN):
+        self._token_url = f"{base_url.strip('/')}/oteams/token/refresh"
+        self._rest_client = rest_client
+        self._refresh_margin = dt.timedelta(seconds=refresh_margin)
+        self._lock = None
+        self._refresh_token = refresh_token
+        self._refresh_token_exp = _JWTAuth._get_token_exp(refresh_token)
+        self._access_token = None
+        self._access_token_exp = None
+
+    def _access_token_expires_soon(self):
+        return self._access_token is None or self._access_token_exp - dt.datetime.utcnow() < self._refresh_margin
+
+    async def get_access_token(self):
+        if self._access_token_expires_soon():
+            # lock is created in the running event loop
+            if self._lock is None:
+                self._lock = asyncio.Lock()
+            # only one coroutine refreshes the token, the others wait for it
+            async with self._lock:
+                if self._access_token_expires_soon():
+                    self._access_token, self._access_token_exp = await self._request_access_token()
+        return self._access_token
+
+    async def _request_access_token(self):
+        # check if token expired
+        if self._refresh_token_exp - dt.datetime.utcnow() < dt.timedelta(seconds=1):
+            raise InvalidToken("Api token expired.")
+        response = await self._rest_client._request(
+            "post",
+            self._token_url,
+            authenticate=False,
+            json=dict(refresh=self._refresh_token)
+        )
+        async with response:
+            if response.status == 401:
+                raise InvalidToken("Api token was refused by the server.")
+            response.raise_for_status()
+            token = (await response.json(content_type=None))["access"]
+        return token, _JWTAuth._get_token_exp(token)
+
+
+async def _write_content(response, buffer, chunk_size):
+    transferred = 0
+    async for chunk in response.content.iter_chunked(chunk_size):
+        buffer.write(chunk)
+        transferred += len(chunk)
+    return transferred
+
+
+def _get_query_params(params):
+    # same conversion as requests: lists and tuples are sent as repeated keys, None values are dropped, others are
+    # converted to str
+    query_params = []
+    for k, v in (params.items() if hasattr(params, "items") else params):
+        values = v if isinstance(v, (list, tuple)) else [v]
+        query_params.extend((k, str(value)) for value in values if value is not None)
+    return query_params
+
+
+def _get_client_timeout(timeout):
+    if timeout is None:
+        return aiohttp.ClientTimeout(total=None)
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return aiohttp.ClientTimeout(total=None, sock_connect=connect, sock_read=read)
+    return aiohttp.ClientTimeout(total=None, sock_connect=timeout, sock_read=timeout)
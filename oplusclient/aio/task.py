@@ -0,0 +1,94 @@
+import time
+import asyncio
+
+from ..exceptions import TaskTimeoutError
+from ..task import Task, iter_poll_delays, DEFAULT_PERIOD, DEFAULT_MAX_PERIOD, DEFAULT_BACKOFF
+
+
+class AsyncTask:
+    route = Task.route
+
+    def __init__(self, task_id, client):
+        """
+        Parameters
+        ----------
+        task_id : str
+        client  : AsyncRestClient
+             Client used for API calls.
+
+        Examples
+        --------
+        >>> t = AsyncTask(task_id, client)
+        >>> success = await t.wait_for_completion()
+        """
+        self._task_id = task_id
+        self._client = client
+        self._response = dict(finished=False)
+
+    async def reload(self):
+        """
+        Coroutine to retrieve task information and update the object accordingly.
+        """
+        self._response = await self._client.retrieve(self.route, self._task_id)
+
+    @property
+    def response(self):
+        """
+        Task information as of last reload.
+        """
+        return self._response.copy()
+
+    @property
+    def finished(self):
+        return self._response["finished"]
+
+    @property
+    def status_code(self):
+        return self._response["status_code"]
+
+    @property
+    def message(self):
+        return self._response["message"]
+
+    async def wait_for_completion(
+            self,
+            period=DEFAULT_PERIOD,
+            max_period=DEFAULT_MAX_PERIOD,
+            backoff=DEFAULT_BACKOFF,
+            timeout=None
+    ):
+        """
+        Coroutine to reload data until task finishes.
+
+        Parameters
+        ----------
+        period  : int
+            Number of milliseconds between the first successive data reloads.
+        max_period : int
+            Maximum number of milliseconds between successive data reloads.
+        backoff : float
+            Factor applied to the period after each reload.
+        timeout : float or None
+            Maximum number of seconds to wait for.
+
+        Returns
+        -------
+        bool
+          Task success state as indicated by the status code.
+
+        Raises
+        ------
+        TaskTimeoutError
+        """
+        start = time.monotonic()
+        for delay in iter_poll_delays(period=period, max_period=max_period, backoff=backoff):
+            await self.reload()
+            if self._response["finished"]:
+                break
+            if timeout is not None:
+                remaining = timeout - (time.monotonic() - start)
+                if remaining <= 0:
+                    raise TaskTimeoutError(f"Timeout reached ({timeout}s).")
+                delay = min(delay, remaining)
+            await asyncio.sleep(delay)
+        return self._response["status_code"] == 200
@@ -1,17 +1,72 @@
-from .rest_client import RestClient
+from .rest_client import (
+    RestClient, DEFAULT_POOL_CONNECTIONS, DEFAULT_POOL_MAXSIZE, DEFAULT_TIMEOUT, DEFAULT_TOKEN_REFRESH_MARGIN
+)
+from .result_cache import ResultCache, DEFAULT_CACHE_MAX_SIZE
+from .record_cache import RecordCache, DEFAULT_RECORD_CACHE_TTL
 from .endpoints import BaseEndpoint
 from . import models
 
 
 class Client:
-    def __init__(self, api_token=None, base_url=None):
+    def __init__(
+            self,
+            api_token=None,
+            base_url=None,
+            retry_policy=None,
+            session=None,
+            pool_connections=DEFAULT_POOL_CONNECTIONS,
+            pool_maxsize=DEFAULT_POOL_MAXSIZE,
+            timeout=DEFAULT_TIMEOUT,
+            token_refresh_margin=DEFAULT_TOKEN_REFRESH_MARGIN,
+            token_cache_path=None,
+            cache_dir=None,
+            cache_max_size=DEFAULT_CACHE_MAX_SIZE,
+            record_cache_ttl=DEFAULT_RECORD_CACHE_TTL
+    ):
         """
         Parameters
         ----------
         api_token
         base_url: default https://oplus-back.openergy.fr/api/v1
+        retry_policy: oplusclient.RetryPolicy or None
+            policy used to retry failed requests (server errors, throttling, connection errors), default RetryPolicy()
+        session: requests.Session or None
+            session shared with other clients (see oplusclient.create_session), if None a new one is created
+        pool_connections: int
+            number of hosts (api, blob storages) for which a connection pool is kept (ignored if session is given)
+        pool_maxsize: int
+            maximum number of connections kept in each host pool, should not be lower than the number of threads
+            using the client
+        timeout: float or tuple or None
+            (connect, read) timeouts in seconds
+        token_refresh_margin: float
+            number of seconds before its expiry at which the access token is refreshed
+        token_cache_path: str or None
+            if given (for example ~/.oplusclient/token_cache.json), access tokens are cached in this file and reused by
+            clients of other processes using the same api token and base url, which saves a request at start up
+        cache_dir: str or None
+            if given (for example ~/.oplusclient/results), results of successful simulations (get_out_* methods,
+            download_eplus_output) are cached in this directory and read from it by next calls
+        cache_max_size: int
+            maximum size of the results cache in bytes, least recently used results are removed beyond it
+        record_cache_ttl: float
+            number of seconds during which related records (simulation weather, obat, ...) retrieved by get_* methods
+            are reused, unless they are updated, deleted, reloaded or modified by a detail action through this client.
+            0 (default) disables it: records modified by other clients would be seen stale meanwhile.
         """
-        self.rest_client: RestClient = RestClient(api_token=api_token, base_url=base_url)
+        self.rest_client: RestClient = RestClient(
+            api_token=api_token,
+            base_url=base_url,
+            retry_policy=retry_policy,
+            session=session,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            timeout=timeout,
+            token_refresh_margin=token_refresh_margin,
+            token_cache_path=token_cache_path
+        )
+        self.result_cache = None if cache_dir is None else ResultCache(cache_dir, max_size=cache_max_size)
+        self.record_cache = RecordCache(ttl=record_cache_ttl)
 
         # geometry
         self.geometry = BaseEndpoint(
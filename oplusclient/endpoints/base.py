@@ -1,6 +1,11 @@
 import logging
+import threading
+import collections
+from concurrent.futures import ThreadPoolExecutor
 
 from ..models import BaseModel
+from ..models.base import get_compact_model_cls, _get_projection
+from ..frames import build_frame
 
 logger = logging.getLogger(__name__)
 
@@ -20,10 +25,24 @@ class BaseEndpoint:
         self.client = client
         self.model_cls = BaseModel if model_cls is None else model_cls
 
-    def data_to_record(self, data):
-        return self.model_cls(self, data)
+    def data_to_record(self, data, compact=False, partial=False):
+        if compact:
+            record = get_compact_model_cls(self.model_cls, tuple(data))(self, data)
+        else:
+            record = self.model_cls(self, data)
+        if partial:
+            record._set_partial(True)
+        return record
 
-    def list(self, filter_by=None, limit=DEFAULT_LIST_LIMIT, offset=0, extra_params=None):
+    def _list_data(
+            self,
+            filter_by=None,
+            limit=DEFAULT_LIST_LIMIT,
+            offset=0,
+            extra_params=None,
+            fields=None,
+            exclude=None
+    ):
         params = dict()
         if filter_by is not None:
             params.update(filter_by)
@@ -33,29 +52,199 @@ class BaseEndpoint:
             params["length"] = limit
         if offset > 0:
             params["start"] = offset
-        records_data = self.client.rest_client.list(
+        return self.client.rest_client.list(
             self.route,
-            params=params
+            params=params,
+            **_get_projection(fields, exclude)
         )["data"]
-        return [self.data_to_record(data) for data in records_data]
-
-    def iter(self, filter_by=None, extra_params=None):
-        limit = DEFAULT_LIST_LIMIT
-        _i = 0
-        for i in range(self.MAX_ITERATIONS):
-            offset = i * limit
-            records = self.list(
+
+    def list(
+            self,
+            filter_by=None,
+            limit=DEFAULT_LIST_LIMIT,
+            offset=0,
+            extra_params=None,
+            compact=False,
+            fields=None,
+            exclude=None
+    ):
+        """
+        Parameters
+        ----------
+        filter_by: dict or None
+        limit: int
+        offset: int
+        extra_params: dict or None
+        compact: bool
+            if True, records are memory efficient (see iter)
+        fields: list of str or None
+            only request these fields (and id), other fields are loaded on first access (one request per record)
+        exclude: list of str or None
+            do not request these fields, they are loaded on first access (one request per record)
+
+        Returns
+        -------
+        list of oplusclient.models.BaseModel
+        """
+        records_data = self._list_data(
+            filter_by=filter_by,
+            limit=limit,
+            offset=offset,
+            extra_params=extra_params,
+            fields=fields,
+            exclude=exclude
+        )
+        partial = fields is not None or exclude is not None
+        return [self.data_to_record(data, compact=compact, partial=partial) for data in records_data]
+
+    def _iter_pages_data(
+            self,
+            filter_by=None,
+            extra_params=None,
+            page_size=DEFAULT_LIST_LIMIT,
+            prefetch=0,
+            fields=None,
+            exclude=None
+    ):
+        if page_size <= 0:
+            raise ValueError(f"page_size must be strictly positive, got {page_size}")
+        # set as soon as a short (last) page is received, so that no page past it is requested anymore
+        last_page_received = threading.Event()
+
+        def list_page(page_index):
+            records_data = self._list_data(
                 filter_by=filter_by,
-                limit=limit,
-                offset=offset,
-                extra_params=extra_params
+                limit=page_size,
+                offset=page_index * page_size,
+                extra_params=extra_params,
+                fields=fields,
+                exclude=exclude
             )
-            for record in records:
-                yield record
-            if len(records) < limit:
-                break
-        else:
-            raise RuntimeError(f"maximum iteration was reached ({self.MAX_ITERATIONS}), stopping")
+            if len(records_data) < page_size:
+                last_page_received.set()
+            return records_data
+
+        if prefetch <= 0:
+            for i in range(self.MAX_ITERATIONS):
+                records_data = list_page(i)
+                yield records_data
+                if len(records_data) < page_size:
+                    break
+            else:
+                raise RuntimeError(f"maximum iteration was reached ({self.MAX_ITERATIONS}), stopping")
+            return
+
+        # offset paging: next pages can be requested before the current one is consumed
+        executor = ThreadPoolExecutor(max_workers=prefetch)
+        pending = collections.deque()
+        try:
+            next_page_index = 0
+            while True:
+                while len(pending) <= prefetch and not last_page_received.is_set():
+                    pending.append(executor.submit(list_page, next_page_index))
+                    next_page_index += 1
+                records_data = pending.popleft().result()
+                yield records_data
+                if len(records_data) < page_size:
+                    break
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def iter(
+            self,
+            filter_by=None,
+            extra_params=None,
+            page_size=DEFAULT_LIST_LIMIT,
+            prefetch=0,
+            compact=False,
+            fields=None,
+            exclude=None
+    ):
+        """
+        Iterate through records, page by page.
+
+        Parameters
+        ----------
+        filter_by: dict or None
+        extra_params: dict or None
+        page_size: int
+            number of records per page
+        prefetch: int
+            number of pages requested in the background while the current page is being consumed. If 0, pages are
+            requested one after another and iteration stops after MAX_ITERATIONS pages, else iteration is not limited.
+            Pages are no longer requested once the last one is received, but up to prefetch pages past it may already
+            be in flight (they are empty).
+        compact: bool
+            if True, records are memory efficient (their data can only be replaced, not modified in place), see
+            oplusclient.models.base.get_compact_model_cls
+        fields: list of str or None
+            only request these fields (and id), other fields are loaded on first access (one request per record)
+        exclude: list of str or None
+            do not request these fields, they are loaded on first access (one request per record)
+
+        Returns
+        -------
+        typing.Iterator of oplusclient.models.BaseModel
+        """
+        partial = fields is not None or exclude is not None
+        for records_data in self._iter_pages_data(
+                filter_by=filter_by,
+                extra_params=extra_params,
+                page_size=page_size,
+                prefetch=prefetch,
+                fields=fields,
+                exclude=exclude
+        ):
+            for data in records_data:
+                yield self.data_to_record(data, compact=compact, partial=partial)
+
+    def list_frame(
+            self,
+            filter_by=None,
+            extra_params=None,
+            columns=None,
+            dtypes=None,
+            parse_dates=None,
+            page_size=DEFAULT_LIST_LIMIT,
+            prefetch=0
+    ):
+        """
+        List all records in a dataframe, built page by page from the listed data (no record is created).
+
+        Parameters
+        ----------
+        filter_by: dict or None
+        extra_params: dict or None
+        columns: list of str or None
+            fields to request and keep (all if None)
+        dtypes: dict or None
+            column name: dtype (for example dict(status="category"))
+        parse_dates: list of str or None
+            columns converted to datetimes
+        page_size: int
+            number of records per page
+        prefetch: int
+            number of pages requested in the background while the current page is being converted (see iter)
+
+        Returns
+        -------
+        pd.DataFrame
+            indexed by record id
+        """
+        return build_frame(
+            self._iter_pages_data(
+                filter_by=filter_by,
+                extra_params=extra_params,
+                page_size=page_size,
+                prefetch=prefetch,
+                fields=None if columns is None else ["id"] + [c for c in columns if c != "id"]
+            ),
+            columns=columns,
+            dtypes=dtypes,
+            parse_dates=parse_dates
+        )
 
     def get_one_and_only_one(self, filter_by=None):
         params = dict()
@@ -68,6 +257,25 @@ class BaseEndpoint:
         rep_data = self.client.rest_client.create(self.route, data)
         return self.data_to_record(rep_data)
 
-    def retrieve(self, record_id, params=None):
-        rep_data = self.client.rest_client.retrieve(self.route, record_id, params=params)
-        return self.data_to_record(rep_data)
+    def retrieve(self, record_id, params=None, fields=None, exclude=None):
+        """
+        Parameters
+        ----------
+        record_id: str
+        params: dict or None
+        fields: list of str or None
+            only request these fields (and id), other fields are loaded on first access
+        exclude: list of str or None
+            do not request these fields, they are loaded on first access
+
+        Returns
+        -------
+        oplusclient.models.BaseModel
+        """
+        rep_data = self.client.rest_client.retrieve(
+            self.route,
+            record_id,
+            params=params,
+            **_get_projection(fields, exclude)
+        )
+        return self.data_to_record(rep_data, partial=fields is not None or exclude is not None)
@@ -1,3 +1,12 @@
+import queue
+import threading
+
+from ..models.base import get_compact_model_cls, _get_projection
+
+# number of pages of simulations requested in advance by iter (0: no background producer)
+DEFAULT_PREFETCH = 0
+
+
 class SimulationEndpoint:
     def __init__(
             self,
@@ -11,10 +20,23 @@ class SimulationEndpoint:
         self.client = client
         self.model_cls = Simulation
 
-    def data_to_record(self, data):
-        return self.model_cls(self, data)
+    def data_to_record(self, data, compact=False, partial=False):
+        if compact:
+            record = get_compact_model_cls(self.model_cls, tuple(data))(self, data)
+        else:
+            record = self.model_cls(self, data)
+        if partial:
+            record._set_partial(True)
+        return record
+
+    def _list_data(self, filter_by_status=None, next_marker=None, extra_params=None, fields=None, exclude=None):
+        params = dict(status=filter_by_status, next_marker=next_marker)
+        if extra_params is not None:
+            params.update(extra_params)
+        data = self.client.rest_client.list(self.route, params=params, **_get_projection(fields, exclude))
+        return data["data"], data.get("next_marker")
 
-    def list(self, filter_by_status=None, next_marker=None):
+    def list(self, filter_by_status=None, next_marker=None, compact=False, fields=None, exclude=None):
         """
         List simulations.
 
@@ -22,29 +44,125 @@ class SimulationEndpoint:
         ----------
         filter_by_status: str or None
         next_marker: str
+        compact: bool
+            if True, simulations are memory efficient (their data can only be replaced, not modified in place)
+        fields: list of str or None
+            only request these fields (for example ["id", "name", "status"] to skip logs), other fields are loaded
+            on first access (one request per simulation)
+        exclude: list of str or None
+            do not request these fields, they are loaded on first access (one request per simulation)
 
         Returns
         -------
         list of oplusclient.models.Simulation
         str
         """
-        data = self.client.rest_client.list(
-            self.route, params=dict(status=filter_by_status, next_marker=next_marker)
+        records_data, next_marker = self._list_data(
+            filter_by_status=filter_by_status,
+            next_marker=next_marker,
+            fields=fields,
+            exclude=exclude
+        )
+        partial = fields is not None or exclude is not None
+        return [self.data_to_record(data, compact=compact, partial=partial) for data in records_data], next_marker
+
+    def _iter_pages_data(self, filter_by_status=None, prefetch=DEFAULT_PREFETCH, fields=None, exclude=None):
+        if prefetch <= 0:
+            next_marker = None
+            while True:
+                records_data, next_marker = self._list_data(
+                    filter_by_status=filter_by_status,
+                    next_marker=next_marker,
+                    fields=fields,
+                    exclude=exclude
+                )
+                yield records_data
+                if next_marker is None:
+                    break
+            return
+
+        # pages are requested by a background producer, blocked while the queue is full. When iteration is closed,
+        # the queue is drained so that the producer is released, and it stops after its current put.
+        pages = queue.Queue(maxsize=prefetch)
+        closed = threading.Event()
+
+        def put(item):
+            pages.put(item)
+            return not closed.is_set()
+
+        def produce():
+            try:
+                marker = None
+                while True:
+                    page_data, marker = self._list_data(
+                        filter_by_status=filter_by_status,
+                        next_marker=marker,
+                        fields=fields,
+                        exclude=exclude
+                    )
+                    if not put((page_data, None)):
+                        return
+                    if marker is None:
+                        break
+                put((None, None))
+            except Exception as e:
+                put((None, e))
+
+        producer = threading.Thread(target=produce, daemon=True)
+        producer.start()
+        try:
+            while True:
+                records_data, error = pages.get()
+                if error is not None:
+                    raise error
+                if records_data is None:
+                    break
+                yield records_data
+        finally:
+            closed.set()
+            while True:
+                try:
+                    pages.get_nowait()
+                except queue.Empty:
+                    break
+
+    def iter(self, filter_by_status=None, prefetch=DEFAULT_PREFETCH, compact=False, fields=None, exclude=None):
+        """
+        Iterate through simulations.
+
+        Parameters
+        ----------
+        filter_by_status: str or None
+        prefetch: int
+            maximum number of pages requested by a background thread while the current page is being consumed (pages
+            are requested one after another, without thread, if 0)
+        compact: bool
+            if True, simulations are memory efficient (their data can only be replaced, not modified in place)
+        fields: list of str or None
+            only request these fields (and id), other fields are loaded on first access (see list)
+        exclude: list of str or None
+            do not request these fields, they are loaded on first access (see list)
+
+        Returns
+        -------
+        typing.Iterator of oplusclient.models.Simulation
+        """
+        partial = fields is not None or exclude is not None
+        for records_data in self._iter_pages_data(
+                filter_by_status=filter_by_status,
+                prefetch=prefetch,
+                fields=fields,
+                exclude=exclude
+        ):
+            for data in records_data:
+                yield self.data_to_record(data, compact=compact, partial=partial)
+
+    def retrieve(self, record_id, params=None, fields=None, exclude=None):
+        rep_data = self.client.rest_client.retrieve(
+            self.route,
+            record_id,
+            params=params,
+            **_get_projection(fields, exclude)
         )
-        records_data = data["data"]
-        next_marker = data.get("next_marker")
-        return [self.data_to_record(data) for data in records_data], next_marker
-
-    def iter(self, filter_by_status=None):
-        next_marker = None
-        while True:
-            candidates, next_marker = self.list(filter_by_status=filter_by_status, next_marker=next_marker)
-            for c in candidates:
-                yield c
-            if next_marker is None:
-                break
-
-    def retrieve(self, record_id, params=None):
-        rep_data = self.client.rest_client.retrieve(self.route, record_id, params=params)
-        return self.data_to_record(rep_data)
+        return self.data_to_record(rep_data, partial=fields is not None or exclude is not None)
 
@@ -23,3 +23,22 @@ class MultipleRecordsFoundError(OplusClientError):
 class InvalidToken(OplusClientError):
     pass
 
+
+class TaskTimeoutError(OplusClientError):
+    pass
+
+
+class BatchError(OplusClientError):
+    def __init__(self, message, errors, results):
+        """
+        Parameters
+        ----------
+        message: str
+        errors: dict
+            item index: exception, for failed items
+        results: list
+            result of each item (None for failed items)
+        """
+        super().__init__(message)
+        self.errors = errors
+        self.results = results
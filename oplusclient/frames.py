@@ -0,0 +1,37 @@
+import pandas as pd
+
+
+def build_frame(pages_data, columns=None, dtypes=None, parse_dates=None):
+    """
+    Build a dataframe of records from pages of records data.
+
+    Parameters
+    ----------
+    pages_data: iterable of list of dict
+    columns: list of str or None
+        fields to keep (all if None), id is always kept
+    dtypes: dict or None
+        column name: dtype
+    parse_dates: list of str or None
+        columns converted to datetimes
+
+    Returns
+    -------
+    pd.DataFrame
+        indexed by record id
+    """
+    if columns is not None and "id" not in columns:
+        columns = ["id"] + list(columns)
+    # each page is converted as soon as it is received, so that only one page of records data is held at a time
+    frames = [pd.DataFrame.from_records(records_data, columns=columns) for records_data in pages_data]
+    frames = [f for f in frames if len(f) > 0]
+    if len(frames) == 0:
+        df = pd.DataFrame(columns=["id"] if columns is None else columns)
+    else:
+        df = pd.concat(frames, ignore_index=True)
+    for column in (parse_dates or []):
+        if column in df.columns:
+            df[column] = pd.to_datetime(df[column])
+    if dtypes is not None:
+        df = df.astype({column: dtype for column, dtype in dtypes.items() if column in df.columns})
+    return df.set_index("id")
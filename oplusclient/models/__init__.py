@@ -1,5 +1,5 @@
-from .base import BaseModel
-from .import_export_base import ImportExportBaseModel
+from .base import BaseModel, prefetch_related
+from .import_export_base import ImportExportBaseModel, ImportExportOperation, import_files, export_files
 
 from .geometry import Geometry
 from .floorspace import Floorspace
@@ -1,27 +1,59 @@
+import sys
+import threading
 from typing import TYPE_CHECKING
+from concurrent.futures import ThreadPoolExecutor
+
+from ..rest_client import DEFAULT_MAX_WORKERS
 
 if TYPE_CHECKING:
     from ..endpoints import BaseEndpoint
 
 
+# string values of compact records up to this length are interned (ids, statuses, dates are then shared between
+# records)
+COMPACT_INTERN_MAX_LENGTH = 64
+
+# compact model classes, by (model class, fields, partial)
+_compact_model_classes = dict()
+_compact_model_classes_lock = threading.Lock()
+
+
 class BaseModel:
+    # related fields that can be prefetched (see prefetch_related): field name -> client endpoint attribute
+    _related_endpoints = dict()
+    # True if the record data only holds some fields (see BaseEndpoint.list fields and exclude)
+    _partial = False
+
     def __init__(self, endpoint: "BaseEndpoint", data):
         self.endpoint = endpoint
         self.client = self.endpoint.client
         self.data = data
 
     def __getattr__(self, item):
-        if item not in self.data:
+        # data is looked up in __dict__ so that copies and unpickling (no __init__ call) do not recurse
+        data = self.__dict__.get("data")
+        if data is None or item not in data:
+            if self._can_load(item, data):
+                self.reload()
+                return getattr(self, item)
             raise AttributeError(f"{item} not found")
-        return self.data[item]
+        return data[item]
+
+    def _can_load(self, item, data):
+        # fields that were not requested are loaded on first access, private and special names are never fields
+        return self._partial and not item.startswith("_") and data is not None and "id" in data
+
+    def _set_partial(self, partial):
+        self._partial = partial
 
     def __repr__(self):
+        # data is read directly: missing fields of partial records are not loaded
+        data = self.data
         msg = f"<{self.__class__.__name__}: "
-        try:
-            name = self.name
-            msg += f"{name} ({self.id})>"
-        except AttributeError:
-            msg += f"{self.id}>"
+        if "name" in data:
+            msg += f"{data['name']} ({data.get('id')})>"
+        else:
+            msg += f"{data.get('id')}>"
         return msg
 
     def _get_related(self, name, endpoint):
@@ -35,12 +67,16 @@ class BaseModel:
             return [self._get_related_from_data(d, endpoint) for d in data]
         elif isinstance(data, dict):
             return endpoint.data_to_record(data)
-        else:  # by id
-            return endpoint.retrieve(data)
+        else:  # by id, records are shared through the client record cache
+            record = self.client.record_cache.get(endpoint.route, data)
+            if record is None:
+                record = endpoint.retrieve(data)
+                self.client.record_cache.set(endpoint.route, data, record)
+            return record
 
     def reload(self):
         reloaded_data = self.endpoint.client.rest_client.retrieve(self.endpoint.route, self.id)
-        self.data = reloaded_data
+        self._set_data(reloaded_data)
 
     def update(self, **data):
         rep_data = self.client.rest_client.partial_update(
@@ -48,13 +84,21 @@ class BaseModel:
             self.id,
             data
         )
-        self.data = rep_data
+        self._set_data(rep_data)
+
+    def _set_data(self, data):
+        # full data received from the server: shared copies and derived state are outdated
+        self.data = data
+        if self._partial:
+            self._set_partial(False)
+        self.client.record_cache.invalidate(self.endpoint.route, self.id)
 
     def delete(self):
         self.client.rest_client.delete(
             self.endpoint.route,
             self.id
         )
+        self.client.record_cache.invalidate(self.endpoint.route, self.id)
 
     def detail_action(self, action_name, method="get", data=None, params=None):
         rep_data = self.client.rest_client.detail_action(
@@ -65,4 +109,175 @@ class BaseModel:
             data=data,
             params=params
         )
+        if method.lower() != "get":  # record may have been modified (imported data, cleared series, ...)
+            self.client.record_cache.invalidate(self.endpoint.route, self.id)
         return rep_data
+
+
+class _CompactRecord:
+    """
+    Memory efficient record: field values are stored in a tuple, field names in a key table shared by all records of
+    the class (see get_compact_model_cls), and short strings are shared between records. data is a copy of the record
+    data (modifying it does not modify the record).
+    """
+    __slots__ = ()
+    _model_cls = None
+    _fields = ()
+    _field_indexes = dict()
+
+    @property
+    def client(self):
+        return self.endpoint.client
+
+    @client.setter
+    def client(self, value):
+        # client is always the endpoint client
+        pass
+
+    @property
+    def data(self):
+        return dict(zip(self._fields, self._values))
+
+    @data.setter
+    def data(self, data):
+        fields = tuple(data)
+        if fields != self._fields:
+            self.__class__ = get_compact_model_cls(self._model_cls, fields, partial=self._partial)
+        self._values = tuple(
+            sys.intern(v) if type(v) is str and len(v) <= COMPACT_INTERN_MAX_LENGTH else v for v in data.values()
+        )
+
+    def __getattr__(self, item):
+        index = self._field_indexes.get(item)
+        if index is None:
+            if self._can_load(item, self._field_indexes):
+                self.reload()
+                return getattr(self, item)
+            raise AttributeError(f"{item} not found")
+        return self._values[index]
+
+    def _set_partial(self, partial):
+        self.__class__ = get_compact_model_cls(self._model_cls, self._fields, partial=partial)
+
+
+def get_compact_model_cls(model_cls, fields, partial=False):
+    """
+    Get the compact version of a model class, for records having given fields.
+
+    Parameters
+    ----------
+    model_cls: type
+        BaseModel subclass
+    fields: tuple of str
+    partial: bool
+        True if records only hold some fields of the model, missing fields are then loaded on first access
+
+    Returns
+    -------
+    type
+        subclass of model_cls
+    """
+    key = (model_cls, fields, partial)
+    compact_model_cls = _compact_model_classes.get(key)
+    if compact_model_cls is None:
+        with _compact_model_classes_lock:
+            compact_model_cls = _compact_model_classes.get(key)
+            if compact_model_cls is None:
+                # slots are defined once per model class, so that records can switch between its compact classes
+                base_key = (model_cls, None, None)
+                if base_key not in _compact_model_classes:
+                    _compact_model_classes[base_key] = type(
+                        model_cls.__name__,
+                        (_CompactRecord, model_cls),
+                        dict(__slots__=("endpoint", "_values"), __module__=model_cls.__module__, _model_cls=model_cls)
+                    )
+                compact_model_cls = type(
+                    model_cls.__name__,
+                    (_compact_model_classes[base_key],),
+                    dict(
+                        __slots__=(),
+                        __module__=model_cls.__module__,
+                        _fields=fields,
+                        _field_indexes={field: i for i, field in enumerate(fields)},
+                        _partial=partial
+                    )
+                )
+                _compact_model_classes[key] = compact_model_cls
+    return compact_model_cls
+
+
+def _get_projection(fields, exclude):
+    """
+    Records are identified by their id (reload, lazy loading of missing fields, ...): it is always requested.
+
+    Returns
+    -------
+    dict
+        fields and exclude arguments of the rest client list and retrieve methods
+    """
+    if fields is not None and "id" not in fields:
+        fields = ["id"] + list(fields)
+    if exclude is not None and "id" in exclude:
+        exclude = [field for field in exclude if field != "id"]
+    return dict(fields=fields, exclude=exclude)
+
+
+def prefetch_related(records, *names, max_workers=DEFAULT_MAX_WORKERS):
+    """
+    Retrieve the records related to many records in one pass: each distinct related record is retrieved once
+    (concurrently) and stored in the client record cache, where the get_* methods of the records then find it if the
+    cache is enabled (Client record_cache_ttl).
+
+    Parameters
+    ----------
+    records: list of BaseModel
+        records of a same client
+    names: str
+        related fields, for example "weather_id", "obat_id", "geometry_id" for simulations
+    max_workers: int
+        maximum number of records retrieved concurrently
+
+    Returns
+    -------
+    dict
+        related field name -> {related record id: related record}
+
+    Examples
+    --------
+    >>> client = Client(api_token, record_cache_ttl=60)
+    >>> simulations = simulation_group.list_all_simulations()
+    >>> prefetch_related(simulations, "weather_id", "obat_id")
+    >>> weathers = [s.get_weather() for s in simulations]  # no requests
+    """
+    records = list(records)
+    if len(records) == 0:
+        return {name: dict() for name in names}
+    client = records[0].client
+
+    # distinct related ids, by field
+    to_resolve = []
+    for name in names:
+        ids = set()
+        for record in records:
+            if name not in record._related_endpoints:
+                raise ValueError(f"{name} can't be prefetched on {record.__class__.__name__} records.")
+            data = record.data.get(name)
+            for related_data in (data if isinstance(data, list) else [data]):
+                if isinstance(related_data, str):
+                    ids.add(related_data)
+        endpoint = getattr(client, records[0]._related_endpoints[name])
+        to_resolve.extend((name, endpoint, related_id) for related_id in sorted(ids))
+
+    def resolve(item):
+        _, endpoint, related_id = item
+        related = client.record_cache.get(endpoint.route, related_id)
+        if related is None:
+            related = endpoint.retrieve(related_id)
+            client.record_cache.set(endpoint.route, related_id, related)
+        return related
+
+    related_records = {name: dict() for name in names}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for (name, _, related_id), related in zip(to_resolve, executor.map(resolve, to_resolve)):
+            related_records[name][related_id] = related
+    return related_records
@@ -17,7 +17,8 @@ class Floorspace(BaseModel):
         """
         Download this floorspace.
 
-        Will save the floorspace to buffer_or_path is not None, else will return the content as bytes.
+        Will save the floorspace to buffer_or_path (and return the number of bytes written) if it is not None, else will
+        return the content as bytes.
 
         Parameters
         ----------
@@ -25,7 +26,7 @@ class Floorspace(BaseModel):
 
         Returns
         -------
-        bytes or None
+        bytes or int
         """
         download_url = self.detail_action("read_blob_url")["blob_url"]
         return self.client.rest_client.download(download_url, buffer_or_path=buffer_or_path)
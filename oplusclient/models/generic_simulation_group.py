@@ -1,7 +1,8 @@
 from . import SimulationGroup, Weather, Geometry, Obat
+from .simulation_group import _AddSimulationsMixin, _format_date
 
 
-class GenericSimulationGroup(SimulationGroup):
+class GenericSimulationGroup(_AddSimulationsMixin, SimulationGroup):
     def add_simulation(
         self,
         name,
@@ -24,8 +25,9 @@ class GenericSimulationGroup(SimulationGroup):
         weather: Weather or str
         geometry: Geometry or str
         obat: Obat or str
-        start: datetime.date
-        end: datetime.date
+        start: datetime.date or str
+            date, or iso formatted date string
+        end: datetime.date or str
         variant: str or None
         substitute_modifications: dict or None
         outputs_detailed_nfen12831: bool
@@ -35,29 +37,49 @@ class GenericSimulationGroup(SimulationGroup):
         -------
         oplusclient.models.Simulation
         """
+        return self._add_simulation_data(self._get_add_simulation_data(
+            name,
+            weather,
+            geometry,
+            obat,
+            start,
+            end,
+            variant=variant,
+            substitute_modifications=substitute_modifications,
+            outputs_detail_nfen12831=outputs_detail_nfen12831,
+            outputs_report=outputs_report
+        ))
+
+    @staticmethod
+    def _get_add_simulation_data(
+        name,
+        weather,
+        geometry,
+        obat,
+        start,
+        end,
+        variant=None,
+        substitute_modifications=None,
+        outputs_detail_nfen12831=False,
+        outputs_report=False
+    ):
         if isinstance(obat, Obat):
             obat = obat.id
         if isinstance(weather, Weather):
             weather = weather.id
         if isinstance(geometry, Geometry):
             geometry = geometry.id
-        return self.simulation_endpoint.data_to_record(
-            self.detail_action(
-                "add_simulation",
-                "POST",
-                data=dict(
-                    name=name,
-                    weather_id=weather,
-                    geometry_id=geometry,
-                    obat_id=obat,
-                    start=start.strftime("%Y-%m-%dT00:00:00"),
-                    end=end.strftime("%Y-%m-%dT23:59:59"),
-                    variant=variant,
-                    substitute_modifications=substitute_modifications,
-                    outputs_detail_nfen12831=outputs_detail_nfen12831,
-                    outputs_report=outputs_report
-                )
-            )
+        return dict(
+            name=name,
+            weather_id=weather,
+            geometry_id=geometry,
+            obat_id=obat,
+            start=_format_date(start, "00:00:00"),
+            end=_format_date(end, "23:59:59"),
+            variant=variant,
+            substitute_modifications=substitute_modifications,
+            outputs_detail_nfen12831=outputs_detail_nfen12831,
+            outputs_report=outputs_report
         )
 
     def delete_simulation(self, simulation):
@@ -73,3 +95,4 @@ class GenericSimulationGroup(SimulationGroup):
         if isinstance(simulation, Simulation):
             simulation = simulation.id
         self.detail_action("delete_simulation", "DELETE", data=dict(id=simulation))
+        self._unindex_simulation(simulation)
@@ -2,6 +2,8 @@ from .import_export_base import ImportExportBaseModel
 
 
 class Geometry(ImportExportBaseModel):
+    _related_endpoints = dict(floorspace="floorspace")
+
     def get_floorspace(self):
         """
         Get associated floorspace.
@@ -23,6 +25,23 @@ class Geometry(ImportExportBaseModel):
         import_format: str
             format of the file ('idf', 'gbxml', 'ogw'), not relevant for floorspace geometries
         """
+        self.import_file_async(buffer_or_path, import_format=import_format).result()
+
+    def import_file_async(self, buffer_or_path, import_format="ogw"):
+        """
+        Upload a file and start its import, without waiting for the import to finish.
+
+        Parameters
+        ----------
+        buffer_or_path: str
+            path of the file to upload
+        import_format: str
+            format of the file ('idf', 'gbxml', 'ogw'), not relevant for floorspace geometries
+
+        Returns
+        -------
+        oplusclient.models.ImportExportOperation
+        """
         # upload
         if self.format == "floorspace":
             import_format = "floorspace"
@@ -32,7 +51,7 @@ class Geometry(ImportExportBaseModel):
                 raise ValueError("For non-floorspace geometries, the format must be specified when importing.")
             self._upload(buffer_or_path)
         # import
-        self._import(import_format)
+        return self._import_async(import_format)
 
     def download_ogw(self, buffer_or_path=None):
         """
@@ -1,7 +1,78 @@
-from ..task import Task
+from concurrent.futures import ThreadPoolExecutor
+
+from ..exceptions import BatchError
+from ..rest_client import DEFAULT_MAX_WORKERS
+from ..task import Task, as_completed
 from .base import BaseModel
 
 
+class ImportExportOperation:
+    def __init__(self, task=None, error_message="Operation failed.", on_success=None):
+        """
+        Handle on an import or export performed by the platform.
+
+        Parameters
+        ----------
+        task: Task or None
+            platform task, None if there is nothing to wait for
+        error_message: str
+            message of the error raised if the task fails
+        on_success: callable or None
+            called (once) when the task has succeeded, its return value is the result of the operation
+        """
+        self.task = task
+        self._error_message = error_message
+        self._on_success = on_success
+        self._completed = False
+        self._result = None
+
+    def done(self):
+        """
+        Returns
+        -------
+        bool
+            True if the platform task is finished (reloads the task if needed)
+        """
+        return self.task is None or self.task.finished
+
+    def result(self, timeout=None):
+        """
+        Wait for the platform task, then return the operation result.
+
+        Parameters
+        ----------
+        timeout: float or None
+            maximum number of seconds to wait for the task
+
+        Returns
+        -------
+        bytes or int or None
+            for exports: content if no buffer_or_path was given, else number of bytes written
+
+        Raises
+        ------
+        RuntimeError
+            if the task failed
+        TaskTimeoutError
+        """
+        if self._completed:
+            return self._result
+        if self.task is not None:
+            if self.task._response["finished"]:
+                success = self.task._response["status_code"] == 200
+            else:
+                success = self.task.wait_for_completion(timeout=timeout)
+            if not success:
+                message = f"{self._error_message} Error:\n{self.task.message}"
+                if self.task.response.get("_out_text"):
+                    message += f"\n{self.task.response['_out_text']}"
+                raise RuntimeError(message)
+        if self._on_success is not None:
+            self._result = self._on_success()
+        self._completed = True
+        return self._result
+
+
 class ImportExportBaseModel(BaseModel):
     def _upload(self, buffer_or_path, path="upload_url"):
         upload_url = self.detail_action(path)["blob_url"]
@@ -11,23 +82,20 @@ class ImportExportBaseModel(BaseModel):
         download_url = self.detail_action(path)["blob_url"]
         return self.client.rest_client.download(download_url, buffer_or_path=buffer_or_path)
 
-    def _import(self, import_format, **kwargs):
+    def _import_async(self, import_format, **kwargs):
         response = self.detail_action(
             "import_data",
             "PATCH",
             data=dict(import_format=import_format, **kwargs),
         )
-        if response:
-            task_id = response["user_task"]
-            import_task = Task(task_id, self.client.rest_client)
-            success = import_task.wait_for_completion()
-            if not success:
-                raise RuntimeError(
-                    f"Import failed. Error:\n"
-                    f"{import_task.message}"
-                )
+        if not response:
+            return ImportExportOperation()
+        return ImportExportOperation(Task(response["user_task"], self.client.rest_client), "Import failed.")
 
-    def _export(
+    def _import(self, import_format, **kwargs):
+        self._import_async(import_format, **kwargs).result()
+
+    def _export_async(
             self,
             path="export_data",
             export_format=None,
@@ -39,8 +107,124 @@ class ImportExportBaseModel(BaseModel):
             params["export_format"] = export_format
         response = self.detail_action(path, "GET", params=params)
         export_task = Task(response["user_task"], self.client.rest_client)
-        success = export_task.wait_for_completion()
-        if not success:
-            raise RuntimeError(f"Import failed. Error:\n{export_task.message}\n{export_task.response['_out_text']}")
-        download_url = export_task.response["data"]["blob_url"]
-        return self.client.rest_client.download(download_url, buffer_or_path=buffer_or_path)
+
+        def download():
+            download_url = export_task.response["data"]["blob_url"]
+            return self.client.rest_client.download(download_url, buffer_or_path=buffer_or_path)
+
+        return ImportExportOperation(export_task, "Export failed.", on_success=download)
+
+    def _export(
+            self,
+            path="export_data",
+            export_format=None,
+            params=None,
+            buffer_or_path=None
+    ):
+        return self._export_async(
+            path=path,
+            export_format=export_format,
+            params=params,
+            buffer_or_path=buffer_or_path
+        ).result()
+
+
+def import_files(imports, max_workers=DEFAULT_MAX_WORKERS, timeout=None):
+    """
+    Import files in many records (Weather, Obat, Geometry).
+
+    Uploads run concurrently, each import is started on the platform as soon as its file is uploaded, and all imports
+    are then waited for together.
+
+    Parameters
+    ----------
+    imports: iterable of tuple
+        (record, buffer_or_path) or (record, buffer_or_path, import_file_kwargs)
+    max_workers: int
+        maximum number of concurrent uploads
+    timeout: float or None
+        maximum number of seconds to wait for the imports
+
+    Raises
+    ------
+    BatchError
+        if some imports failed, once all imports are finished
+    """
+    def start_import(item):
+        record, buffer_or_path, kwargs = (tuple(item) + (dict(),))[:3]
+        return record.import_file_async(buffer_or_path, **kwargs)
+
+    _run_operations(imports, start_import, max_workers, timeout, "import")
+
+
+def export_files(exports, max_workers=DEFAULT_MAX_WORKERS, timeout=None):
+    """
+    Export many records (Weather, Obat).
+
+    Exports are started concurrently on the platform, and each export is downloaded as soon as it is finished.
+
+    Parameters
+    ----------
+    exports: iterable of tuple
+        (record, export_kwargs), export_kwargs being given to the record export method (export_format, buffer_or_path,
+        ...)
+    max_workers: int
+        maximum number of concurrent requests
+    timeout: float or None
+        maximum number of seconds to wait for the exports
+
+    Returns
+    -------
+    list
+        export results, in the order of exports
+
+    Raises
+    ------
+    BatchError
+        if some exports failed, once all exports are finished
+    """
+    def start_export(item):
+        record, kwargs = item
+        return record.export_async(**kwargs)
+
+    return _run_operations(exports, start_export, max_workers, timeout, "export")
+
+
+def _run_operations(items, start_operation, max_workers, timeout, operation_name):
+    items = list(items)
+    results = [None] * len(items)
+    errors = dict()
+
+    def start(i):
+        try:
+            return start_operation(items[i])
+        except Exception as e:
+            errors[i] = e
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        operations = list(executor.map(start, range(len(items))))
+
+        def complete(i):
+            try:
+                results[i] = operations[i].result()
+            except Exception as e:
+                errors[i] = e
+
+        # results (downloads) are processed as soon as their task is finished
+        tasks_indexes = {id(op.task): i for i, op in enumerate(operations) if op is not None and op.task is not None}
+        futures = [
+            executor.submit(complete, i) for i, op in enumerate(operations) if op is not None and op.task is None
+        ]
+        for task in as_completed([operations[i].task for i in tasks_indexes.values()], timeout=timeout):
+            futures.append(executor.submit(complete, tasks_indexes[id(task)]))
+        for future in futures:
+            future.result()
+
+    if len(errors) > 0:
+        raise BatchError(
+            f"{len(errors)} {operation_name}(s) out of {len(items)} failed:\n" +
+            "\n".join(f"\t{i}: {e}" for i, e in sorted(errors.items())),
+            errors,
+            results
+        )
+    return results
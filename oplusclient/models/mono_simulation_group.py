@@ -4,6 +4,8 @@ from .simulation_group import SimulationGroup
 
 
 class MonoSimulationGroup(SimulationGroup):
+    _related_endpoints = dict(config_obat="obat", config_geometry="geometry", config_weather="weather")
+
     def get_obat(self):
         return self._get_related("config_obat", self.client.obat)
 
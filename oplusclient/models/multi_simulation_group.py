@@ -1,12 +1,23 @@
 import io
-import datetime as dt
+import time
+import logging
+import collections
+from concurrent.futures import ThreadPoolExecutor
 
 import pandas as pd
 from . import SimulationGroup, Weather, Geometry, Obat
+from .simulation_group import _AddSimulationsMixin, _format_date
+from ..exceptions import BatchError, RecordNotFoundError
+from ..rest_client import DEFAULT_MAX_WORKERS
 from ..util import get_id
 
+logger = logging.getLogger(__name__)
 
-class MultiSimulationGroup(SimulationGroup):
+# copy throughput is logged every COPY_LOG_PERIOD copied simulations
+COPY_LOG_PERIOD = 500
+
+
+class MultiSimulationGroup(_AddSimulationsMixin, SimulationGroup):
     def add_simulation(
             self,
             name,
@@ -28,8 +39,9 @@ class MultiSimulationGroup(SimulationGroup):
         weather: Weather or str
         geometry: Geometry or str
         obat: Obat or str
-        start: datetime.date
-        end: datetime.date
+        start: datetime.date or str
+            date, or iso formatted date string
+        end: datetime.date or str
         variant: str or None
         outputs_detail_nfen12831: bool
         outputs_report: bool
@@ -38,28 +50,46 @@ class MultiSimulationGroup(SimulationGroup):
         -------
         Simulation
         """
+        return self._add_simulation_data(self._get_add_simulation_data(
+            name,
+            weather,
+            geometry,
+            obat,
+            start,
+            end,
+            variant=variant,
+            outputs_detail_nfen12831=outputs_detail_nfen12831,
+            outputs_report=outputs_report
+        ))
+
+    @staticmethod
+    def _get_add_simulation_data(
+            name,
+            weather,
+            geometry,
+            obat,
+            start,
+            end,
+            variant=None,
+            outputs_detail_nfen12831=False,
+            outputs_report=False
+    ):
         if isinstance(weather, Weather):
             weather = weather.id
         if isinstance(geometry, Geometry):
             geometry = geometry.id
         if isinstance(obat, Obat):
             obat = obat.id
-        return self.simulation_endpoint.data_to_record(
-            self.detail_action(
-                "add_simulation",
-                "POST",
-                data=dict(
-                    name=name,
-                    weather_id=weather,
-                    geometry_id=geometry,
-                    obat_id=obat,
-                    start=start.strftime("%Y-%m-%dT00:00:00"),
-                    end=end.strftime("%Y-%m-%dT23:59:59"),
-                    variant=variant,
-                    outputs_detail_nfen12831=outputs_detail_nfen12831,
-                    outputs_report=outputs_report
-                )
-            )
+        return dict(
+            name=name,
+            weather_id=weather,
+            geometry_id=geometry,
+            obat_id=obat,
+            start=_format_date(start, "00:00:00"),
+            end=_format_date(end, "23:59:59"),
+            variant=variant,
+            outputs_detail_nfen12831=outputs_detail_nfen12831,
+            outputs_report=outputs_report
         )
 
     def update_simulation(self, **kwargs):
@@ -85,13 +115,15 @@ class MultiSimulationGroup(SimulationGroup):
             kwargs["weather"] = kwargs["weather"].id
         if isinstance(kwargs.get("geometry", None), Geometry):
             kwargs["geometry"] = kwargs["geometry"].id
-        return self.simulation_endpoint.data_to_record(
+        simulation = self.simulation_endpoint.data_to_record(
             self.detail_action(
                 "update_simulation",
                 "PATCH",
                 data=kwargs
             )
         )
+        self._clear_simulations_index()
+        return simulation
 
     def delete_simulation(self, simulation):
         """
@@ -106,6 +138,7 @@ class MultiSimulationGroup(SimulationGroup):
         if isinstance(simulation, Simulation):
             simulation = simulation.id
         self.detail_action("delete_simulation", "DELETE", data=dict(id=simulation))
+        self._unindex_simulation(simulation)
 
     def _get_result(self, detail_route):
         if not self.status == "success":
@@ -182,35 +215,109 @@ class MultiSimulationGroup(SimulationGroup):
         """
         return self._get_result("out_zones")
 
-    def copy(self, destination_simulation_group_name):
+    def copy(self, destination_simulation_group_name, resume=False, max_workers=DEFAULT_MAX_WORKERS):
         """
+        Copy the simulation group and its simulations.
+
+        Source simulations pages are read while simulations are added concurrently to the destination simulation
+        group. If the copy is interrupted, it can be resumed: the destination simulation group is then completed with
+        the simulations it misses.
 
         Parameters
         ----------
         destination_simulation_group_name: copied simulation group name
+        resume: bool
+            if True and a simulation group with this name exists in the project, it is completed (simulations are
+            compared by name) instead of creating a new one
+        max_workers: int
+            maximum number of simulations added concurrently
 
         Returns
         -------
         copied simulation group
+
+        Raises
+        ------
+        BatchError
+            if some simulations could not be added (copy can be resumed)
         """
+        project_id = get_id(self.project)
+        dst_group = None
+        already_copied = collections.Counter()
+        if resume:
+            try:
+                dst_group = self.endpoint.get_one_and_only_one(
+                    filter_by=dict(project=project_id, name=destination_simulation_group_name)
+                )
+            except RecordNotFoundError:
+                pass
+            else:
+                already_copied.update(s.name for s in dst_group.iter_simulations())
+
         # create new simulation group
-        dst_group: MultiSimulationGroup = self.endpoint.create(
-            name=destination_simulation_group_name,
-            project=get_id(self.project),
-            comment=self.comment
-        )
+        if dst_group is None:
+            dst_group: MultiSimulationGroup = self.endpoint.create(
+                name=destination_simulation_group_name,
+                project=project_id,
+                comment=self.comment
+            )
 
         # attach new simulations
-        for src_simu in self.iter_simulations():
-            dst_group.add_simulation(
-                src_simu.name,
-                src_simu.weather_id,
-                src_simu.geometry_id,
-                src_simu.obat_id,
-                dt.datetime.strptime(src_simu.start[:10], "%Y-%m-%d"),
-                dt.datetime.strptime(src_simu.end[:10], "%Y-%m-%d"),
-                variant=src_simu.variant,
-                outputs_detail_nfen12831=src_simu.outputs_detail_nfen12831,
-                outputs_report=src_simu.outputs_report
+        start = time.monotonic()
+        copied_count = 0
+        errors = dict()
+        results = []  # one per source simulation, None if it was already copied or could not be copied
+        pending = collections.deque()
+
+        def collect(i, future):
+            nonlocal copied_count
+            try:
+                results[i] = future.result()
+            except Exception as e:
+                errors[i] = e
+                return
+            copied_count += 1
+            if copied_count % COPY_LOG_PERIOD == 0:
+                _log_copy_throughput(copied_count, start)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for i, src_simu in enumerate(self.iter_simulations()):
+                results.append(None)
+                if already_copied[src_simu.name] > 0:
+                    already_copied[src_simu.name] -= 1
+                    continue
+                # dates are kept as iso strings (no parsing)
+                data = dst_group._get_add_simulation_data(
+                    src_simu.name,
+                    src_simu.weather_id,
+                    src_simu.geometry_id,
+                    src_simu.obat_id,
+                    src_simu.start,
+                    src_simu.end,
+                    variant=src_simu.variant,
+                    outputs_detail_nfen12831=src_simu.outputs_detail_nfen12831,
+                    outputs_report=src_simu.outputs_report
+                )
+                # limit the number of pending requests (and simulations held in memory)
+                while len(pending) >= 2 * max_workers:
+                    collect(*pending.popleft())
+                pending.append((i, executor.submit(dst_group._add_simulation_data, data)))
+            while len(pending) > 0:
+                collect(*pending.popleft())
+        _log_copy_throughput(copied_count, start)
+
+        if len(errors) > 0:
+            raise BatchError(
+                f"{len(errors)} simulation(s) could not be copied, copy can be resumed (resume=True):\n" +
+                "\n".join(f"\t{i}: {e}" for i, e in sorted(errors.items())),
+                errors,
+                results
             )
         return dst_group
+
+
+def _log_copy_throughput(copied_count, start):
+    duration = time.monotonic() - start
+    logger.info(
+        f"{copied_count} simulations copied in {duration:.1f}s ({copied_count / max(duration, 1e-6):.1f} simulations/s)"
+    )
@@ -1,5 +1,5 @@
 import json
-from .import_export_base import ImportExportBaseModel
+from .import_export_base import ImportExportBaseModel, ImportExportOperation
 
 
 class Obat(ImportExportBaseModel):
@@ -14,15 +14,33 @@ class Obat(ImportExportBaseModel):
         import_format: str
             format of the file ('xlsx' or 'obat')
         """
+        self.import_file_async(buffer_or_path, import_format=import_format).result()
+
+    def import_file_async(self, buffer_or_path, import_format="obat"):
+        """
+        Upload a file and start its import, without waiting for the import to finish ('obat' files are imported
+        directly).
+
+        Parameters
+        ----------
+        buffer_or_path: str
+            path to the file
+        import_format: str
+            format of the file ('xlsx' or 'obat')
+
+        Returns
+        -------
+        oplusclient.models.ImportExportOperation
+        """
         if import_format == "obat":
             if hasattr(buffer_or_path, "read"):
                 self.client.rest_client.update("ossbat/obat_contents", self.id, data=json.load(buffer_or_path))
             else:
                 with open(buffer_or_path, "r") as f:
                     self.client.rest_client.update("ossbat/obat_contents", self.id, data=json.load(f))
-        else:
-            self._upload(buffer_or_path)
-            self._import(import_format)
+            return ImportExportOperation()
+        self._upload(buffer_or_path)
+        return self._import_async(import_format)
 
     def download_obat(self, buffer_or_path=None):
         """
@@ -54,3 +72,20 @@ class Obat(ImportExportBaseModel):
         bytes
         """
         return self._export(export_format=export_format, buffer_or_path=buffer_or_path)
+
+    def export_async(self, export_format, buffer_or_path=None):
+        """
+        Start an export, without waiting for it to finish. The exported file is downloaded when the result of the
+        returned operation is requested.
+
+        Parameters
+        ----------
+        export_format: str
+            only 'xlsx' available
+        buffer_or_path: BytesIO like or string
+
+        Returns
+        -------
+        oplusclient.models.ImportExportOperation
+        """
+        return self._export_async(export_format=export_format, buffer_or_path=buffer_or_path)
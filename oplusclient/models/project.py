@@ -2,6 +2,8 @@ from .import_export_base import BaseModel
 
 
 class Project(BaseModel):
+    _related_endpoints = dict(organization="organization")
+
     def get_organization(self):
         """
         Get this project organization.
@@ -1,19 +1,52 @@
+import os
 import time
 import json
 import io
+import hashlib
+import tempfile
+import warnings
 import datetime as dt
+from urllib.parse import parse_qs
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_EXCEPTION
 
+import numpy as np
 import pandas as pd
 
 from .. import exceptions
+from ..rest_client import DEFAULT_MAX_WORKERS
+from ..task import _sleep_before_timeout
 from .import_export_base import BaseModel
 
 
 DT_FORMAT = "%Y-%m-%d %H:%M:%S"
 ISO_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
 
+# generic viz blob info (container url and sas token) is reused until it is about to expire
+GENERIC_VIZ_EXPIRY_MARGIN = dt.timedelta(minutes=1)
+# lifetime given to generic viz blob info when its sas token does not state an expiry
+GENERIC_VIZ_DEFAULT_TTL = dt.timedelta(minutes=5)
+
+# record field identifying a run of the simulation in the result cache: logs are rewritten by each run
+CACHE_VERSION_FIELD = "logs"
+
+# detail routes of the csv results available on successful simulations
+RESULT_ROUTES = (
+    "out_envelope",
+    "out_monthly_comfort",
+    "out_monthly_comfort_indicators",
+    "out_monthly_consumption",
+    "out_monthly_miscellaneous",
+    "out_monthly_thermal_balance",
+    "out_monthly_weather",
+    "out_zones"
+)
+
 
 class Simulation(BaseModel):
+    _related_endpoints = dict(obat_id="obat", geometry_id="geometry", weather_id="weather")
+    _generic_viz_blob_info = None
+    _generic_viz_blob_info_exp = None
+
     def get_obat(self):
         """
         Get obat.
@@ -54,18 +87,48 @@ class Simulation(BaseModel):
         """
         return self.endpoint.parent
 
+    def _get_cache_key(self, result_name, *params):
+        """
+        Returns None if results must not be cached (no cache, simulation not finished successfully, or run version
+        unknown).
+        """
+        if self.client.result_cache is None:
+            return None
+        if self._partial and CACHE_VERSION_FIELD not in self.data:
+            # projected record: version field is loaded
+            self.reload()
+        data = self.data
+        version = data.get(CACHE_VERSION_FIELD)
+        if data.get("status") != "success" or not version:
+            # without version, the key could match results of a previous run
+            return None
+        return self.client.result_cache.get_key(
+            self.id,
+            result_name,
+            hashlib.sha256(version.encode("utf-8")).hexdigest(),
+            *params
+        )
+
     def _get_result(self, detail_route):
         if not self.status == "success":
             raise ValueError(
                 "Results are only available if the simulation finished successfully. However its status is"
                 f" {self.status}."
             )
+        cache_key = self._get_cache_key(detail_route)
+        if cache_key is not None:
+            df = self.client.result_cache.get_frame(cache_key)
+            if df is not None:
+                return df
         download_url = self.detail_action(detail_route)["blob_url"]
-        return pd.read_csv(io.StringIO(self.client.rest_client.download(
+        df = pd.read_csv(io.StringIO(self.client.rest_client.download(
             download_url
         ).decode("utf-8")))
+        if cache_key is not None:
+            self.client.result_cache.set_frame(cache_key, df)
+        return df
 
-    def wait_for_completion(self, print_logs=False, reload_freq=3):
+    def wait_for_completion(self, print_logs=False, reload_freq=3, on_log=None, timeout=None):
         """
         Wait until the simulation has finished running
 
@@ -75,25 +138,91 @@ class Simulation(BaseModel):
             if True, prints simulation logs
         reload_freq: float
             time between two reloads in seconds
+        on_log: callable or None
+            called with each new line of the simulation logs
+        timeout: float or None
+            maximum number of seconds to wait for
+
+        Raises
+        ------
+        TaskTimeoutError
+        """
+        if on_log is None and print_logs:
+            on_log = print
+        for line in self.iter_logs(reload_freq=reload_freq, timeout=timeout):
+            if on_log is not None:
+                on_log(line)
+
+    def iter_logs(self, reload_freq=3, timeout=None):
+        """
+        Iterate through the simulation logs lines as they are written, until the simulation has finished running.
+
+        Only the end of the logs that was not seen yet is processed at each reload. If the server supports it
+        (logs_offset parameter), only this end is transferred.
+
+        Parameters
+        ----------
+        reload_freq: float
+            time between two reloads in seconds
+        timeout: float or None
+            maximum number of seconds to wait for
+
+        Returns
+        -------
+        typing.Iterator of str
+
+        Raises
+        ------
+        TaskTimeoutError
         """
-        logs = ""
+        start = time.monotonic()
+        seen_length = 0
+        pending_line = ""
         while True:
-            self.reload()
-            if print_logs:
-                new_logs = ""
-                r_logs = self.logs.splitlines()
-                for line_a, line_b in zip(logs.splitlines() + [""] * (len(r_logs) - len(logs.splitlines())), r_logs):
-                    if line_b.strip() != line_a.strip():
-                        new_logs += line_b + "\n"
-                logs = "\n".join(r_logs)
-                if new_logs.strip():
-                    print(new_logs.strip("\n"))
-            if not self.status == "running":
+            self._reload_logs(seen_length)
+            logs = self.data.get("logs") or ""
+            if len(logs) < seen_length:
+                # logs were reset (simulation was restarted)
+                seen_length, pending_line = 0, ""
+            new_logs = pending_line + logs[seen_length:]
+            seen_length = len(logs)
+            running = self.status == "running"
+            lines = new_logs.splitlines(keepends=True)
+            # last line is kept until it is complete, or the simulation is finished
+            pending_line = lines.pop() if running and len(lines) > 0 and not lines[-1].endswith("\n") else ""
+            for line in lines:
+                yield line.rstrip("\r\n")
+            if not running:
                 break
-            time.sleep(reload_freq)
-
-    def _get_generic_viz_blob_info(self):
-        return self.detail_action("generic_viz")
+            _sleep_before_timeout(reload_freq, start, timeout)
+
+    def _reload_logs(self, logs_offset):
+        logs = self.data.get("logs") or ""
+        reloaded_data = self.client.rest_client.retrieve(
+            self.endpoint.route,
+            self.id,
+            params=dict(logs_offset=logs_offset) if logs_offset > 0 else None
+        )
+        # a server supporting offsets echoes it and only sends the logs end
+        if reloaded_data.get("logs_offset") == logs_offset and logs_offset > 0:
+            reloaded_data["logs"] = logs[:logs_offset] + (reloaded_data.get("logs") or "")
+        self.data = reloaded_data
+
+    def _get_generic_viz_blob_info(self, force_refresh=False):
+        """
+        Blob info is cached on the simulation until its sas token is about to expire.
+        """
+        now = dt.datetime.utcnow()
+        if (
+                force_refresh or
+                self._generic_viz_blob_info is None or
+                self._generic_viz_blob_info_exp - now < GENERIC_VIZ_EXPIRY_MARGIN
+        ):
+            generic_viz_blob_info = self.detail_action("generic_viz")
+            exp = _get_sas_token_exp(generic_viz_blob_info["sas_token"])
+            self._generic_viz_blob_info_exp = now + GENERIC_VIZ_DEFAULT_TTL if exp is None else exp
+            self._generic_viz_blob_info = generic_viz_blob_info
+        return self._generic_viz_blob_info
 
     def _download_out_hourly_file(self, file_path, generic_viz_blob_info=None):
         """
@@ -101,9 +230,21 @@ class Simulation(BaseModel):
         """
         if generic_viz_blob_info is None:
             generic_viz_blob_info = self._get_generic_viz_blob_info()
-        data = self.client.rest_client.download(
-            f"{generic_viz_blob_info['container_url']}{file_path}?{generic_viz_blob_info['sas_token']}"
-        )
+        try:
+            data = self.client.rest_client.download(
+                f"{generic_viz_blob_info['container_url']}{file_path}?{generic_viz_blob_info['sas_token']}"
+            )
+        except exceptions.HttpClientError as e:
+            # sas token was revoked or expired earlier than announced: refresh it (unless a concurrent download already
+            # did) and try again once
+            if e.status_code != 403:
+                raise
+            generic_viz_blob_info = self._get_generic_viz_blob_info(
+                force_refresh=self._generic_viz_blob_info is generic_viz_blob_info
+            )
+            data = self.client.rest_client.download(
+                f"{generic_viz_blob_info['container_url']}{file_path}?{generic_viz_blob_info['sas_token']}"
+            )
         if isinstance(data, bytes):
             data = data.decode("utf-8")
         return data
@@ -116,11 +257,11 @@ class Simulation(BaseModel):
         raw = self._download_out_hourly_file(f"{year}/index.json", generic_viz_blob_info=generic_viz_blob_info)
         return json.loads(raw)
 
-    def _download_out_hourly_se(self, year, series_id, generic_viz_blob_info=None):
-        raw = self._download_out_hourly_file(f"{year}/{series_id}.json")
-        return json.loads(raw)
+    def _download_out_hourly_se(self, year, series_id, generic_viz_blob_info=None, dtype="float64"):
+        raw = self._download_out_hourly_file(f"{year}/{series_id}.json", generic_viz_blob_info=generic_viz_blob_info)
+        return _parse_json_series(raw, dtype)
 
-    def get_out_hourly(self, series_ids=None):
+    def get_out_hourly(self, series_ids=None, max_workers=DEFAULT_MAX_WORKERS, dtype="float64"):
         """
         Parameters
         ----------
@@ -128,53 +269,87 @@ class Simulation(BaseModel):
             if not provided: all outputs will be downloaded from stored csv
             if provided: only given ids will be provided, outputs will be downloaded series by series using
                 (as in generic viz). The series ids can be found using the "get_out_hourly_columns" dataframe.
+        max_workers: int
+            maximum number of series downloaded concurrently (series by series mode only)
+        dtype: str
+            dtype of the values columns ("float64" or "float32")
 
         Returns
         -------
         pd.DataFrame
         """
+        if series_ids is not None:
+            series_ids = list(series_ids)
+        cache_key = self._get_cache_key(
+            "out_hourly",
+            dtype,
+            "all" if series_ids is None else ",".join(series_ids)
+        )
+        if cache_key is not None:
+            df = self.client.result_cache.get_frame(cache_key)
+            if df is not None:
+                return df
+        df = self._get_out_hourly(series_ids, max_workers, dtype)
+        if cache_key is not None:
+            self.client.result_cache.set_frame(cache_key, df)
+        return df
+
+    def _get_out_hourly(self, series_ids, max_workers, dtype):
         # whole csv
         if series_ids is None:
             download_url = self.detail_action("hourly_csv")["blob_url"]
-            df = pd.read_csv(
-                io.BytesIO(self.client.rest_client.download(download_url)),
-                compression="zip",
-                header=0,
-                index_col=0,
-                encoding="utf-8"
-            )
+            # archive is streamed to disk rather than held in memory
+            with tempfile.TemporaryDirectory() as dir_path:
+                zip_path = os.path.join(dir_path, "hourly.zip")
+                self.client.rest_client.download(download_url, buffer_or_path=zip_path)
+                # columns are read first so that values are parsed with an explicit dtype (no type inference)
+                columns = pd.read_csv(zip_path, compression="zip", header=0, index_col=0, nrows=0).columns
+                df = pd.read_csv(
+                    zip_path,
+                    compression="zip",
+                    header=0,
+                    index_col=0,
+                    encoding="utf-8",
+                    dtype={c: dtype for c in columns}
+                )
             df.index = pd.to_datetime(df.index, format=DT_FORMAT)
             return df
 
-        # series by series mode
-
-        # prepare generic viz info
-        generic_viz_blob_info = self._get_generic_viz_blob_info()
+        # series by series mode (generic viz info is cached on the simulation, and refreshed by downloads if needed)
 
         # choose year
-        metadata = self._download_out_hourly_metadata(generic_viz_blob_info=generic_viz_blob_info)
+        metadata = self._download_out_hourly_metadata()
         if len(metadata["years"]) != 1:
             raise NotImplementedError(
                 f"Series by series download mode is not implemented for multiple year simulations. "
                 f"Current simulation years: {metadata['years']}")
         year = metadata["years"][0]
 
-        # fixme: make async
-
-        # index
-        index_data = self._download_out_hourly_index(year, generic_viz_blob_info=generic_viz_blob_info)
-        index = pd.DatetimeIndex(map(lambda x: dt.datetime.strptime(x, ISO_FORMAT), index_data))
-
-        data = dict()
-        for se_id in series_ids:
-            # todo: manage not found
+        def download_se(se_id):
             try:
-                data[se_id] = self._download_out_hourly_se(year, se_id, generic_viz_blob_info=generic_viz_blob_info)
+                return self._download_out_hourly_se(year, se_id, dtype=dtype)
             except exceptions.HttpClientError as e:
                 if e.status_code == 404:
                     raise ValueError(f"Simulation does not contain a series with given id '{se_id}'.")
-
-        return pd.DataFrame(data=data, index=index)
+                raise
+
+        # index and series are downloaded concurrently, the dataframe is only built once everything is there
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(series_ids) + 1))) as executor:
+            index_future = executor.submit(self._download_out_hourly_index, year)
+            series_futures = [executor.submit(download_se, se_id) for se_id in series_ids]
+            futures = [index_future] + series_futures
+            # first failure: downloads that have not started are cancelled instead of being waited for
+            done, not_done = wait(futures, return_when=FIRST_EXCEPTION)
+            for future in done:
+                if future.exception() is not None:
+                    for pending_future in not_done:
+                        pending_future.cancel()
+                    raise future.exception()
+            series_data = [future.result() for future in series_futures]
+            index_data = index_future.result()
+        index = pd.to_datetime(index_data, format=ISO_FORMAT)
+
+        return pd.DataFrame(data=dict(zip(series_ids, series_data)), index=index)
 
     def get_out_hourly_columns(self):
         """
@@ -259,10 +434,21 @@ class Simulation(BaseModel):
 
         Returns
         -------
-        bytes or None
-        """
-        download_url = self.detail_action("eplus_output")["blob_url"]
-        return self.client.rest_client.download(download_url, buffer_or_path=buffer_or_path)
+        bytes or int
+        """
+        cache_key = self._get_cache_key("eplus_output")
+        if cache_key is None:
+            download_url = self.detail_action("eplus_output")["blob_url"]
+            return self.client.rest_client.download(download_url, buffer_or_path=buffer_or_path)
+        # downloaded once, then copied to buffer_or_path (and stored if it fits in the cache)
+        return self.client.result_cache.fetch_file(
+            cache_key,
+            lambda f: self.client.rest_client.download(
+                self.detail_action("eplus_output")["blob_url"],
+                buffer_or_path=f
+            ),
+            buffer_or_path=buffer_or_path
+        )
 
     def download_report(self, buffer_or_path=None):
         """
@@ -272,12 +458,52 @@ class Simulation(BaseModel):
 
         Returns
         -------
-        bytes or None
+        bytes or int
         """
         download_url = self.detail_action("report_output")["blob_url"]
         return self.client.rest_client.download(download_url, buffer_or_path=buffer_or_path)
 
 
+def _get_sas_token_exp(sas_token):
+    """
+    Returns the expiry (signed expiry field) of a sas token as a naive utc datetime, or None if it is not found.
+    """
+    se = parse_qs(sas_token.lstrip("?")).get("se")
+    if not se:
+        return None
+    for fmt in ("%Y-%m-%dT%H:%M:%SZ", "%Y-%m-%dT%H:%MZ", "%Y-%m-%d"):
+        try:
+            return dt.datetime.strptime(se[0], fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def _parse_json_series(raw, dtype):
+    """
+    Parse a json list of numbers straight into a numpy array, falling back on json decoding if it contains other
+    values (null, ...).
+    """
+    content = raw.strip()
+    if content.startswith("[") and content.endswith("]"):
+        content = content[1:-1]
+        if content.strip() == "":
+            return np.array([], dtype=dtype)
+        with warnings.catch_warnings():
+            # numpy warns (instead of raising) when a value can't be parsed
+            warnings.simplefilter("error", DeprecationWarning)
+            try:
+                values = np.fromstring(content, dtype=dtype, sep=",")
+            except (DeprecationWarning, ValueError):
+                values = None
+        if values is not None and len(values) == content.count(",") + 1:
+            return values
+    data = json.loads(raw)
+    if not isinstance(data, list):
+        return data
+    return np.array([np.nan if v is None else v for v in data], dtype=dtype)
+
+
 def _nones_to_str(name):
     return "" if name is None else name
 
@@ -1,17 +1,38 @@
 import time
+import logging
+import datetime as dt
 from typing import Iterable
+from concurrent.futures import ThreadPoolExecutor
 
-from ..endpoints.simulation import SimulationEndpoint
-from ..models.simulation import Simulation
+import numpy as np
+import pandas as pd
+
+from ..endpoints.simulation import SimulationEndpoint, DEFAULT_PREFETCH
+from ..frames import build_frame
+from ..models.simulation import Simulation, RESULT_ROUTES
 from .. import exceptions
-from ..task import Task
+from ..exceptions import BatchError
+from ..rest_client import DEFAULT_MAX_WORKERS
+from ..task import (
+    Task, iter_poll_delays, _sleep_before_timeout, DEFAULT_PERIOD, DEFAULT_MAX_PERIOD, DEFAULT_BACKOFF
+)
 from .base import BaseModel
 
+logger = logging.getLogger(__name__)
+
+# types of simulations_frame columns
+SIMULATIONS_FRAME_DTYPES = dict(status="category")
+SIMULATIONS_FRAME_DATES = ("start", "end")
+
 
 class SimulationGroup(BaseModel):
     def __init__(self, endpoint, data):
         super().__init__(endpoint, data)
         self.simulation_endpoint = SimulationEndpoint(self.client, "/simulations", self)
+        # name -> simulation id index, built by name lookups (simulations are retrieved on lookup, to be up to date)
+        self._simulation_ids_by_name = None
+        # True if the server filters simulations by name, None if unknown
+        self._server_name_filter = None
 
     def run(self, run_old_versions=False, wait_for_start_task=True):
         """
@@ -26,26 +47,51 @@ class SimulationGroup(BaseModel):
             self.detail_action("run", method="POST", params=dict(run_old_versions=run_old_versions))["user_task"],
             self.client.rest_client
         )
+        self._clear_simulations_index()
         if wait_for_start_task:
             if not run_task.wait_for_completion():
                 raise exceptions.OplusClientError(f"Could not start simulation. Message:\n{run_task.message}")
 
-    def wait_for_completion(self, period=200):
+    def wait_for_completion(
+            self,
+            period=DEFAULT_PERIOD,
+            max_period=DEFAULT_MAX_PERIOD,
+            backoff=DEFAULT_BACKOFF,
+            timeout=None
+    ):
         """
         Wait for the simulation group to finish running
 
         Parameters
         ----------
         period  : int
-            Number of milliseconds between successive data reloads.
+            Number of milliseconds between the first successive data reloads.
+        max_period : int
+            Maximum number of milliseconds between successive data reloads.
+        backoff : float
+            Factor applied to the period after each reload.
+        timeout : float or None
+            Maximum number of seconds to wait for.
+
+        Raises
+        ------
+        TaskTimeoutError
         """
-        ms = 1e-3 * period
-        self.reload()
-        while self.working:
-            time.sleep(ms)
+        start = time.monotonic()
+        for delay in iter_poll_delays(period=period, max_period=max_period, backoff=backoff):
             self.reload()
+            if not self.working:
+                break
+            _sleep_before_timeout(delay, start, timeout)
 
-    def iter_simulations(self, filter_by_status=None) -> Iterable[Simulation]:
+    def iter_simulations(
+            self,
+            filter_by_status=None,
+            prefetch=DEFAULT_PREFETCH,
+            compact=False,
+            fields=None,
+            exclude=None
+    ) -> Iterable[Simulation]:
         """
         Iter through all simulations of the simulation group.
 
@@ -53,14 +99,30 @@ class SimulationGroup(BaseModel):
         ----------
         filter_by_status: str or None
             Only list simulations with this status.
+        prefetch: int
+            Maximum number of pages of simulations requested by a background thread while the current one is consumed
+            (0: pages are requested one after another, without thread).
+        compact: bool
+            If True, simulations are memory efficient (their data can only be replaced, not modified in place).
+        fields: list of str or None
+            Only request these fields (for example ["id", "name", "status"] to skip logs), other fields are loaded
+            on first access (one request per simulation).
+        exclude: list of str or None
+            Do not request these fields, they are loaded on first access (one request per simulation).
 
         Returns
         -------
         typing.Iterator of oplusclient.models.Simulation
         """
-        return self.simulation_endpoint.iter(filter_by_status=filter_by_status)
+        return self.simulation_endpoint.iter(
+            filter_by_status=filter_by_status,
+            prefetch=prefetch,
+            compact=compact,
+            fields=fields,
+            exclude=exclude
+        )
 
-    def list_all_simulations(self, filter_by_status=None):
+    def list_all_simulations(self, filter_by_status=None, compact=False, fields=None, exclude=None):
         """
         List all simulations in a simulation group.
 
@@ -71,25 +133,419 @@ class SimulationGroup(BaseModel):
         ----------
         filter_by_status: str or None
             Only list simulations with this status
+        compact: bool
+            If True, simulations are memory efficient (their data can only be replaced, not modified in place),
+            recommended for big simulation groups.
+        fields: list of str or None
+            Only request these fields (and id), other fields are loaded on first access.
+        exclude: list of str or None
+            Do not request these fields, they are loaded on first access.
 
         Returns
         -------
         list of oplusclient.models.Simulation
         """
-        return list(self.iter_simulations(filter_by_status=filter_by_status))
+        return list(self.iter_simulations(
+            filter_by_status=filter_by_status,
+            compact=compact,
+            fields=fields,
+            exclude=exclude
+        ))
+
+    def simulations_frame(self, filter_by_status=None, columns=None, prefetch=DEFAULT_PREFETCH):
+        """
+        List all simulations of the simulation group in a dataframe, built page by page from the listed data (no
+        simulation record is created). status is categorical, start and end are datetimes.
+
+        Parameters
+        ----------
+        filter_by_status: str or None
+            Only list simulations with this status.
+        columns: list of str or None
+            Fields to request and keep (all if None), for example ["name", "status"].
+        prefetch: int
+            Maximum number of pages of simulations requested by a background thread while the current one is converted
+            (0: pages are requested one after another, without thread).
+
+        Returns
+        -------
+        pd.DataFrame
+            indexed by simulation id
+        """
+        return build_frame(
+            self.simulation_endpoint._iter_pages_data(
+                filter_by_status=filter_by_status,
+                prefetch=prefetch,
+                fields=None if columns is None else ["id"] + [c for c in columns if c != "id"]
+            ),
+            columns=columns,
+            dtypes=SIMULATIONS_FRAME_DTYPES,
+            parse_dates=SIMULATIONS_FRAME_DATES
+        )
 
     def get_simulation_by_name(self, name):
         """
         Find a simulation by name.
 
-        Beware on big simulation groups this an be long due to client-side filtering.
-        
+        Simulations are filtered by the server if it supports it, else a name to id index of the simulation group
+        simulations is built on first call (one iteration through all simulations) and reused by next calls, until the
+        simulation group is reloaded or run. The simulation is retrieved at each call.
+
         Returns
         -------
         oplusclient.models.Simulation
         """
-        for s in self.iter_simulations():
-            if s.name == name:
-                return s
-        else:
-            raise exceptions.RecordNotFoundError(f"There are no simulations in this simulation group with name {name}")
+        if self._simulation_ids_by_name is None and self._server_name_filter is not False:
+            # until the filter is known to be supported, only ids and names are requested: a server ignoring it
+            # returns a whole page of simulations
+            probe = self._server_name_filter is None
+            records_data, _ = self.simulation_endpoint._list_data(
+                extra_params=dict(name=name),
+                fields=["id", "name"] if probe else None
+            )
+            # if the server ignored the filter, other simulations are returned
+            self._server_name_filter = all(data["name"] == name for data in records_data)
+            if self._server_name_filter:
+                if len(records_data) == 0:
+                    raise exceptions.RecordNotFoundError(
+                        f"There are no simulations in this simulation group with name {name}")
+                if probe:
+                    return self.simulation_endpoint.retrieve(records_data[0]["id"])
+                return self.simulation_endpoint.data_to_record(records_data[0])
+        try:
+            simulation_id = self._get_simulations_index()[name]
+        except KeyError:
+            raise exceptions.RecordNotFoundError(
+                f"There are no simulations in this simulation group with name {name}") from None
+        try:
+            return self.simulation_endpoint.retrieve(simulation_id)
+        except exceptions.HttpClientError as e:
+            if e.status_code != 404:
+                raise
+        # deleted since the index was built
+        self._unindex_simulation(simulation_id)
+        raise exceptions.RecordNotFoundError(f"There are no simulations in this simulation group with name {name}")
+
+    def get_simulations_by_names(self, names):
+        """
+        Find simulations by name, with one iteration through all simulations of the simulation group.
+
+        Parameters
+        ----------
+        names: list of str
+
+        Returns
+        -------
+        list of oplusclient.models.Simulation
+            simulations, in the order of names
+        """
+        # simulations are listed again (up to date), only the requested ones are kept
+        wanted_names = set(names)
+        simulations_by_name = dict()
+        index = dict()
+        for simulation in self.iter_simulations():
+            index.setdefault(simulation.name, simulation.id)
+            if simulation.name in wanted_names:
+                simulations_by_name.setdefault(simulation.name, simulation)
+        self._simulation_ids_by_name = index
+        missing_names = [name for name in names if name not in simulations_by_name]
+        if len(missing_names) > 0:
+            raise exceptions.RecordNotFoundError(
+                f"There are no simulations in this simulation group with names {', '.join(missing_names)}")
+        return [simulations_by_name[name] for name in names]
+
+    def _set_data(self, data):
+        super()._set_data(data)
+        self._clear_simulations_index()
+
+    def _get_simulations_index(self):
+        if self._simulation_ids_by_name is None:
+            index = dict()
+            for records_data in self.simulation_endpoint._iter_pages_data(fields=["id", "name"]):
+                for data in records_data:
+                    index.setdefault(data["name"], data["id"])
+            self._simulation_ids_by_name = index
+        return self._simulation_ids_by_name
+
+    def _index_simulation(self, simulation):
+        if self._simulation_ids_by_name is not None:
+            self._simulation_ids_by_name.setdefault(simulation.name, simulation.id)
+
+    def _unindex_simulation(self, simulation_id):
+        if self._simulation_ids_by_name is not None:
+            self._simulation_ids_by_name = {
+                name: s_id for name, s_id in self._simulation_ids_by_name.items() if s_id != simulation_id
+            }
+
+    def _clear_simulations_index(self):
+        self._simulation_ids_by_name = None
+
+    def collect_results(self, result_name, max_workers=DEFAULT_MAX_WORKERS):
+        """
+        Collect a result of all successful simulations of the simulation group.
+
+        Results are downloaded and parsed concurrently.
+
+        Parameters
+        ----------
+        result_name: str
+            name of the simulation result, for example "out_monthly_consumption" (see Simulation.get_out_* methods)
+        max_workers: int
+            maximum number of simulation results downloaded concurrently
+
+        Returns
+        -------
+        pd.DataFrame
+            concatenated results, indexed by simulation_id and simulation_name, then by the result index
+
+        Raises
+        ------
+        BatchError
+            if some results could not be collected (results are the result of each simulation, None for failed ones)
+        """
+        if result_name not in RESULT_ROUTES:
+            raise ValueError(f"Unknown result name: {result_name}. Available results: {', '.join(RESULT_ROUTES)}.")
+        keys = []
+        futures = []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # simulations pages are fetched while the first results are being downloaded (logs are not needed)
+            for simulation in self.iter_simulations(filter_by_status="success", fields=["id", "name", "status"]):
+                keys.append((simulation.id, simulation.name))
+                futures.append(executor.submit(simulation._get_result, result_name))
+            frames = []
+            errors = dict()
+            for i, future in enumerate(futures):
+                try:
+                    frames.append(future.result())
+                except Exception as e:
+                    frames.append(None)
+                    errors[i] = e
+        if len(errors) > 0:
+            raise BatchError(
+                f"{len(errors)} result(s) out of {len(frames)} could not be collected:\n" +
+                "\n".join(f"\t{i} ({keys[i][1]}): {e}" for i, e in sorted(errors.items())),
+                errors,
+                frames
+            )
+        if len(frames) == 0:
+            return pd.DataFrame()
+        return pd.concat(frames, keys=keys, names=["simulation_id", "simulation_name"])
+
+
+class _AddSimulationsMixin:
+    """
+    Batch addition of simulations, for simulation groups defining add_simulation and _get_add_simulation_data.
+    """
+    def add_simulations(self, specs, max_workers=DEFAULT_MAX_WORKERS):
+        """
+        Add many simulations.
+
+        All specs are validated before any simulation is added, then simulations are added concurrently.
+
+        Parameters
+        ----------
+        specs: iterable of dict or pd.DataFrame
+            add_simulation arguments of each simulation (dataframe: one row per simulation, one column per argument,
+            missing values are given as None)
+        max_workers: int
+            maximum number of simulations added concurrently
+
+        Returns
+        -------
+        list of oplusclient.models.Simulation
+            added simulations, in the order of specs
+
+        Raises
+        ------
+        BatchError
+            if some specs are invalid (no simulation was added then), or if some simulations could not be added
+            (error results are None)
+        """
+        if isinstance(specs, pd.DataFrame):
+            specs = specs.astype(object).where(specs.notna(), None).to_dict("records")
+
+        # validate and serialize
+        simulations_data = []
+        errors = dict()
+        for i, spec in enumerate(specs):
+            try:
+                simulations_data.append(self._get_add_simulation_data(
+                    **{k: _get_json_value(v) for k, v in spec.items()}
+                ))
+            except (TypeError, ValueError, AttributeError) as e:
+                simulations_data.append(None)
+                errors[i] = e
+        if len(errors) > 0:
+            raise BatchError(
+                f"{len(errors)} simulation spec(s) out of {len(simulations_data)} are invalid, "
+                "no simulation was added:\n" +
+                "\n".join(f"\t{i}: {e}" for i, e in sorted(errors.items())),
+                errors,
+                [None] * len(simulations_data)
+            )
+
+        # there is no batch route: simulations are added concurrently, one request each
+        return self._add_simulations_data(simulations_data, max_workers=max_workers)
+
+    def _add_simulations_data(self, simulations_data, max_workers=DEFAULT_MAX_WORKERS):
+        errors = dict()
+
+        def add(i):
+            try:
+                return self._add_simulation_data(simulations_data[i])
+            except Exception as e:
+                errors[i] = e
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            simulations = list(executor.map(add, range(len(simulations_data))))
+        if len(errors) > 0:
+            raise BatchError(
+                f"{len(errors)} simulation(s) out of {len(simulations_data)} could not be added:\n" +
+                "\n".join(f"\t{i}: {e}" for i, e in sorted(errors.items())),
+                errors,
+                simulations
+            )
+        return simulations
+
+    def _add_simulation_data(self, data):
+        simulation = self.simulation_endpoint.data_to_record(self.detail_action("add_simulation", "POST", data=data))
+        self._index_simulation(simulation)
+        return simulation
+
+
+def _format_date(value, time_str):
+    """
+    Parameters
+    ----------
+    value: datetime.date or str
+        date, or iso formatted date string (time part is ignored)
+    time_str: str
+        HH:MM:SS
+
+    Returns
+    -------
+    str
+        YYYY-MM-DDTHH:MM:SS
+    """
+    if isinstance(value, str):
+        # validation only, string is kept as is
+        dt.date.fromisoformat(value[:10])
+        return f"{value[:10]}T{time_str}"
+    return f"{value.strftime('%Y-%m-%d')}T{time_str}"
+
+
+def _get_json_value(value):
+    # numpy scalars (dataframe rows, arrays) are not json serializable
+    if isinstance(value, (np.number, np.bool_)):
+        return value.item()
+    return value
+
+
+def as_completed(
+        simulation_groups,
+        period=DEFAULT_PERIOD,
+        max_period=DEFAULT_MAX_PERIOD,
+        backoff=DEFAULT_BACKOFF,
+        timeout=None
+):
+    """
+    Iterate through simulation groups as they finish running.
+
+    At each poll, the unfinished simulation groups of a same project are reloaded together with one list request,
+    instead of one request per simulation group.
+
+    Parameters
+    ----------
+    simulation_groups : list of SimulationGroup
+    period  : int
+        Number of milliseconds between the first successive polls.
+    max_period : int
+        Maximum number of milliseconds between successive polls.
+    backoff : float
+        Factor applied to the period after each poll.
+    timeout : float or None
+        Maximum number of seconds to wait for.
+
+    Returns
+    -------
+    typing.Iterator of SimulationGroup
+
+    Raises
+    ------
+    TaskTimeoutError
+    """
+    pending = list(simulation_groups)
+    start = time.monotonic()
+    for delay in iter_poll_delays(period=period, max_period=max_period, backoff=backoff):
+        _reload_simulation_groups(pending)
+        for simulation_group in [sg for sg in pending if not sg.working]:
+            pending.remove(simulation_group)
+            yield simulation_group
+        if len(pending) == 0:
+            break
+        _sleep_before_timeout(delay, start, timeout)
+
+
+def wait_all(
+        simulation_groups,
+        on_completed=None,
+        period=DEFAULT_PERIOD,
+        max_period=DEFAULT_MAX_PERIOD,
+        backoff=DEFAULT_BACKOFF,
+        timeout=None
+):
+    """
+    Wait until all simulation groups are finished (see as_completed).
+
+    Parameters
+    ----------
+    simulation_groups : list of SimulationGroup
+    on_completed : callable or None
+        Called with each simulation group as soon as it is finished.
+    period  : int
+    max_period : int
+    backoff : float
+    timeout : float or None
+
+    Raises
+    ------
+    TaskTimeoutError
+    """
+    for simulation_group in as_completed(
+            simulation_groups,
+            period=period,
+            max_period=max_period,
+            backoff=backoff,
+            timeout=timeout
+    ):
+        if on_completed is not None:
+            on_completed(simulation_group)
+
+
+def _reload_simulation_groups(simulation_groups):
+    # simulation groups are listed by endpoint and project, ids filter reduces the response if the server supports it
+    batches = dict()
+    for simulation_group in simulation_groups:
+        project_id = simulation_group.data.get("project")
+        if isinstance(project_id, dict):
+            project_id = project_id["id"]
+        batches.setdefault((simulation_group.endpoint, project_id), []).append(simulation_group)
+
+    for (endpoint, project_id), batch in batches.items():
+        by_id = {sg.id: sg for sg in batch}
+        if project_id is not None and len(batch) > 1:
+            for records_data in endpoint._iter_pages_data(
+                    filter_by=dict(project=project_id),
+                    extra_params=dict(id__in=",".join(by_id))
+            ):
+                for data in records_data:
+                    simulation_group = by_id.pop(data["id"], None)
+                    if simulation_group is not None:
+                        simulation_group._set_data(data)
+                if len(by_id) == 0:
+                    break
+            if len(by_id) > 0:
+                logger.debug(f"{len(by_id)} simulation group(s) not found by list request, retrieving them")
+        # single simulation groups, and simulation groups missing from the list
+        for simulation_group in by_id.values():
+            simulation_group.reload()
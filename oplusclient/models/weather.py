@@ -37,14 +37,39 @@ class Weather(ImportExportBaseModel):
         csv_decimal: str
             decimal used if the import_format is a csv file
         """
+        self.import_file_async(
+            buffer_or_path,
+            import_format=import_format,
+            csv_separator=csv_separator,
+            csv_decimal=csv_decimal
+        ).result()
+
+    def import_file_async(self, buffer_or_path, import_format="ow", csv_separator=",", csv_decimal="."):
+        """
+        Upload a file and start its import, without waiting for the import to finish.
+
+        Parameters
+        ----------
+        import_format: str
+            format of the file ('csv', 'epw' or 'ow')
+        buffer_or_path: str
+            path to the file
+        csv_separator: str
+            separator used if the import_format is a csv file
+        csv_decimal: str
+            decimal used if the import_format is a csv file
+
+        Returns
+        -------
+        oplusclient.models.ImportExportOperation
+        """
         if import_format == "ow":
             self._upload(buffer_or_path)
-            self._import(import_format)
-        else:
-            series = self.get_weather_series()
-            # TODO: do not use private methods
-            series._upload(buffer_or_path)
-            series._import(import_format, csv_separator=csv_separator, csv_decimal=csv_decimal)
+            return self._import_async(import_format)
+        series = self.get_weather_series()
+        # TODO: do not use private methods
+        series._upload(buffer_or_path)
+        return series._import_async(import_format, csv_separator=csv_separator, csv_decimal=csv_decimal)
 
     def export(self, export_format, buffer_or_path=None, csv_separator=",", csv_decimal="."):
         """
@@ -64,16 +89,41 @@ class Weather(ImportExportBaseModel):
         -------
         bytes
         """
+        return self.export_async(
+            export_format,
+            buffer_or_path=buffer_or_path,
+            csv_separator=csv_separator,
+            csv_decimal=csv_decimal
+        ).result()
+
+    def export_async(self, export_format, buffer_or_path=None, csv_separator=",", csv_decimal="."):
+        """
+        Start an export, without waiting for it to finish. The exported file is downloaded when the result of the
+        returned operation is requested.
+
+        Parameters
+        ----------
+        export_format: str
+            "csv", "epw"
+        buffer_or_path: BytesIO like or string
+        csv_separator: str
+            separator used if the export_format is a csv file
+        csv_decimal: str
+            decimal used if the export_format is a csv file
+
+        Returns
+        -------
+        oplusclient.models.ImportExportOperation
+        """
         if export_format == "ow":
-            return self._export(export_format=export_format, buffer_or_path=buffer_or_path)
-        else:
-            series = self.get_weather_series()
-            # TODO: do not use private methods
-            return series._export(
-                export_format=export_format,
-                params=dict(csv_separator=csv_separator, csv_decimal=csv_decimal),
-                buffer_or_path=buffer_or_path
-            )
+            return self._export_async(export_format=export_format, buffer_or_path=buffer_or_path)
+        series = self.get_weather_series()
+        # TODO: do not use private methods
+        return series._export_async(
+            export_format=export_format,
+            params=dict(csv_separator=csv_separator, csv_decimal=csv_decimal),
+            buffer_or_path=buffer_or_path
+        )
 
     def clear_weather_series(self):
         """Clear the weather series."""
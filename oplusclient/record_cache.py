@@ -0,0 +1,56 @@
+import time
+import threading
+import collections
+
+DEFAULT_RECORD_CACHE_TTL = 0  # seconds, disabled by default
+
+
+class RecordCache:
+    def __init__(self, ttl=DEFAULT_RECORD_CACHE_TTL):
+        """
+        Identity map of the records retrieved by a client to resolve relations, keyed by (route, id). Records are
+        kept ttl seconds, or until they are updated, deleted, reloaded or modified by a detail action through the
+        client. Expired records are removed when new ones are added.
+
+        Parameters
+        ----------
+        ttl: float
+            number of seconds a record is kept, 0 disables the cache
+        """
+        self.ttl = ttl
+        # ordered by expiry, since all records have the same ttl
+        self._records = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, route, record_id):
+        """
+        Returns
+        -------
+        oplusclient.models.BaseModel or None
+        """
+        with self._lock:
+            record, exp = self._records.get((route, record_id), (None, None))
+            if record is None:
+                return None
+            if exp <= time.monotonic():
+                del self._records[(route, record_id)]
+                return None
+            return record
+
+    def set(self, route, record_id, record):
+        if self.ttl <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._records.pop((route, record_id), None)
+            self._records[(route, record_id)] = (record, now + self.ttl)
+            while next(iter(self._records.values()))[1] <= now:
+                self._records.popitem(last=False)
+
+    def invalidate(self, route, record_id):
+        with self._lock:
+            self._records.pop((route, record_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
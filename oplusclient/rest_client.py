@@ -4,92 +4,187 @@ import os
 import datetime as dt
 import json
 import base64
+import logging
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 import requests
+from requests.adapters import HTTPAdapter
 from requests.auth import AuthBase
 
 from .exceptions import InvalidToken, HttpClientError, HttpServerError, RecordNotFoundError, MultipleRecordsFoundError
+from .retry import RetryPolicy
+from .token_cache import TokenCache
+
+logger = logging.getLogger(__name__)
+
+# default number of threads used when the client performs several requests concurrently
+DEFAULT_MAX_WORKERS = 8
+# connection pools are sized so that concurrent operations do not wait for a connection
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 4 * DEFAULT_MAX_WORKERS
+# (connect, read) timeouts in seconds
+DEFAULT_TIMEOUT = (10, 300)
+# access token is refreshed this number of seconds before it expires
+DEFAULT_TOKEN_REFRESH_MARGIN = 30
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+UPLOAD_BLOCK_SIZE = 4 * 1024 * 1024
 
 
 class RestClient:
     def __init__(
             self,
             api_token=None,
-            base_url=None
+            base_url=None,
+            retry_policy=None,
+            session=None,
+            pool_connections=DEFAULT_POOL_CONNECTIONS,
+            pool_maxsize=DEFAULT_POOL_MAXSIZE,
+            timeout=DEFAULT_TIMEOUT,
+            token_refresh_margin=DEFAULT_TOKEN_REFRESH_MARGIN,
+            token_cache_path=None
     ):
         """
         Parameters
         ----------
         api_token
         base_url: default https://oplus-back.openergy.fr/api/v1
+        retry_policy: RetryPolicy or None
+            policy used to retry failed requests, default RetryPolicy()
+        session: requests.Session or None
+            session to use (see create_session), allows to share connection pools between clients. If None, a new
+            session is created (and closed with the client).
+        pool_connections: int
+            number of hosts (api, blob storages) for which a connection pool is kept (ignored if session is given)
+        pool_maxsize: int
+            maximum number of connections kept in each host pool
+        timeout: float or tuple or None
+            (connect, read) timeouts in seconds
+        token_refresh_margin: float
+            number of seconds before its expiry at which the access token is refreshed
+        token_cache_path: str or None
+            if given, access tokens are cached in this file and reused by other processes using the same api token
         """
         if base_url is None:
             base_url = "https://oplus-back.openergy.fr/api/v1"
         self.base_url = base_url[:-1] if base_url.endswith("/") else base_url
-        self._session = requests.Session()
-        self._session.auth = _JWTAuth(
+        self.retry_policy = RetryPolicy() if retry_policy is None else retry_policy
+        self.timeout = timeout
+        self._owns_session = session is None
+        self._session = create_session(pool_connections, pool_maxsize) if session is None else session
+        # api gets its own pool, so that it is not evicted by the pools of the many blob storage hosts
+        if self.base_url not in self._session.adapters:
+            self._session.mount(self.base_url, HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize))
+        # authentication is given request by request so that the session may be shared by clients using other tokens
+        self._auth = _JWTAuth(
             api_token if api_token is not None else getpass("Api token: "),
-            self.base_url
+            self.base_url,
+            self._session,
+            refresh_margin=token_refresh_margin,
+            timeout=timeout,
+            token_cache=None if token_cache_path is None else TokenCache(token_cache_path)
         )
 
+    @property
+    def session(self):
+        return self._session
+
     def close(self):
-        self._session.close()
+        if self._owns_session:
+            self._session.close()
+
+    @property
+    def retry_count(self):
+        """
+        Number of retries performed by the retry policy.
+        """
+        return self.retry_policy.retry_count
+
+    def _request(self, method, url, **kwargs):
+        """
+        Sends a request, retrying it on connection errors and retryable responses according to the retry policy.
+        """
+        kwargs.setdefault("auth", self._auth)
+        kwargs.setdefault("timeout", self.timeout)
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = self._session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if not self.retry_policy.can_retry(method, attempt):
+                    raise
+                self.retry_policy.register_retry(method, url, e)
+                time.sleep(self.retry_policy.get_delay(attempt))
+                continue
+            if not (
+                    self.retry_policy.is_retryable_status(response.status_code) and
+                    self.retry_policy.can_retry(method, attempt)
+            ):
+                return response
+            self.retry_policy.register_retry(method, url, response.status_code)
+            time.sleep(self.retry_policy.get_delay(attempt, response.headers))
+            response.close()
 
     @staticmethod
     def _raise_for_status(response):
-        if response.status_code // 100 == 4:
-            try:
-                data = response.json()
-            except Exception:
-                pass
-            else:
-                if "errors" in data:
-                    error_msg = "\n"
-                    for key, errors_l in data["errors"].items():
-                        error_msg += f"{key}:\n"
-                        for error in errors_l:
-                            error_msg += textwrap.indent(f"{error['detailed_code']}: {error['message']}", "  ") + "\n"
-                    raise HttpClientError(error_msg)
-            raise HttpClientError(f"{response.status_code}: {response.text}", status_code=response.status_code)
-        elif response.status_code // 100 >= 5:
-            raise HttpServerError(f"{response.status_code}: {response.text}")
-
-    def list(self, path, params=None):
-        response = self._session.get(
+        _raise_for_status_code(response.status_code, response.text)
+
+    def list(self, path, params=None, fields=None, exclude=None):
+        """
+        Parameters
+        ----------
+        path: str
+        params: dict or None
+        fields: list of str or None
+            only request these fields of the records
+        exclude: list of str or None
+            do not request these fields of the records
+        """
+        response = self._request(
+            "get",
             f"{self.base_url}/{path}",
-            params=params
+            params=_get_projection_params(params, fields, exclude)
         )
         self._raise_for_status(response)
         return response.json()
 
     def create(self, path, data):
-        response = self._session.post(
+        response = self._request(
+            "post",
             f"{self.base_url}/{path}",
             json=data
         )
         self._raise_for_status(response)
         return response.json()
 
-    def retrieve(self, path, record_id, params=None):
-        response = self._session.get(
+    def retrieve(self, path, record_id, params=None, fields=None, exclude=None):
+        """
+        Parameters
+        ----------
+        path: str
+        record_id: str
+        params: dict or None
+        fields: list of str or None
+            only request these fields of the record
+        exclude: list of str or None
+            do not request these fields of the record
+        """
+        response = self._request(
+            "get",
             f"{self.base_url}/{path}/{record_id}",
-            params=params
+            params=_get_projection_params(params, fields, exclude)
         )
         self._raise_for_status(response)
         return response.json()
 
     def get_one_and_only_one(self, path, params=None):
-        records_list = self.list(path, params=params)["data"]
-        if len(records_list) == 1:
-            return records_list[0]
-        if len(records_list) == 0:
-            raise RecordNotFoundError("Did not find any record matching given conditions.")
-        list_str = "\t" + "\n\t".join([str(r) for r in records_list])
-        raise MultipleRecordsFoundError(
-            f"{len(records_list)} records matching given conditions where returned instead of one :\n{list_str}")
+        return _get_one_and_only_one(self.list(path, params=params)["data"])
 
     def update(self, path, record_id, data):
-        response = self._session.put(
+        response = self._request(
+            "put",
             f"{self.base_url}/{path}/{record_id}",
             json=data
         )
@@ -97,7 +192,8 @@ class RestClient:
         return response.json()
 
     def partial_update(self, path, record_id, data):
-        response = self._session.patch(
+        response = self._request(
+            "patch",
             f"{self.base_url}/{path}/{record_id}",
             json=data
         )
@@ -105,13 +201,14 @@ class RestClient:
         return response.json()
 
     def delete(self, path, resource_id):
-        response = self._session.delete(
+        response = self._request(
+            "delete",
             f"{self.base_url}/{path}/{resource_id}"
         )
         self._raise_for_status(response)
 
     def detail_action(self, path, record_id, action_name, method="get", data=None, params=None):
-        response = self._session.request(
+        response = self._request(
             method,
             f"{self.base_url}/{path}/{record_id}/{action_name}",
             json=data,
@@ -120,52 +217,218 @@ class RestClient:
         self._raise_for_status(response)
         return response.json()
 
-    def download(self, download_url, buffer_or_path=None):
-        response = self._session.get(
-            download_url
-        )
-        self._raise_for_status(response)
-        if isinstance(response.content, bytes):
-            if buffer_or_path is None:
-                return response.content
-            else:
-                if hasattr(buffer_or_path, "write"):
-                    buffer_or_path.write(response.content)
-                else:
-                    with open(buffer_or_path, "wb") as f:
-                        f.write(response.content)
-        elif isinstance(response.content, str):
-            if buffer_or_path is None:
-                return response.content.encode("utf-8")
+    def download(self, download_url, buffer_or_path=None, stream=True, chunk_size=DOWNLOAD_CHUNK_SIZE):
+        """
+        Parameters
+        ----------
+        download_url: str
+        buffer_or_path: buffer or path where to write the content (if None, returns bytes)
+        stream: bool
+            if True, content is written to buffer_or_path chunk by chunk instead of being loaded in memory first
+        chunk_size: int
+            size (in bytes) of the chunks written when streaming
+
+        Returns
+        -------
+        bytes or int
+            content if buffer_or_path is None, else number of bytes transferred
+        """
+        if buffer_or_path is None:
+            response = self._request("get", download_url)
+            self._raise_for_status(response)
+            return response.content
+        response = self._request("get", download_url, stream=stream)
+        try:
+            self._raise_for_status(response)
+            if hasattr(buffer_or_path, "write"):
+                transferred = self._write_content(response, buffer_or_path, stream, chunk_size)
             else:
-                if hasattr(buffer_or_path, "write"):
-                    buffer_or_path.write(response.content)
-                else:
-                    with open(buffer_or_path, "w") as f:
-                        f.write(response.content)
-        else:
-            raise ValueError("Response content is neither str nor bytes")
+                with open(buffer_or_path, "wb") as f:
+                    transferred = self._write_content(response, f, stream, chunk_size)
+        finally:
+            response.close()
+        logger.debug(f"downloaded {transferred} bytes")
+        return transferred
+
+    @staticmethod
+    def _write_content(response, buffer, stream, chunk_size):
+        if not stream:
+            buffer.write(response.content)
+            return len(response.content)
+        transferred = 0
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            buffer.write(chunk)
+            transferred += len(chunk)
+        return transferred
+
+    def upload(self, upload_url, buffer_or_path, block_size=UPLOAD_BLOCK_SIZE, max_workers=DEFAULT_MAX_WORKERS):
+        """
+        Upload a buffer or file to a blob.
+
+        Content is read block by block. If it is bigger than block_size, blocks are uploaded in parallel (each one
+        being retried on its own) then committed, else content is uploaded with a single request.
 
-    def upload(self, upload_url, buffer_or_path):
+        Parameters
+        ----------
+        upload_url: str
+        buffer_or_path: buffer or path of the content to upload
+        block_size: int
+            size (in bytes) of uploaded blocks
+        max_workers: int
+            maximum number of blocks uploaded (and held in memory) at the same time
+        """
         if hasattr(buffer_or_path, "read"):
-            response = self._session.put(
+            self._upload_buffer(upload_url, buffer_or_path, block_size, max_workers)
+        else:
+            with open(os.path.realpath(buffer_or_path), "rb") as f:
+                self._upload_buffer(upload_url, f, block_size, max_workers)
+
+    def _upload_buffer(self, upload_url, buffer, block_size, max_workers):
+        block = _read_block(buffer, block_size)
+        next_block = _read_block(buffer, block_size)
+        if len(next_block) == 0:
+            response = self._request(
+                "put",
                 upload_url,
-                buffer_or_path.read(),
+                data=block,
                 headers={"x-ms-blob-type": "BlockBlob"}
             )
-        else:
-            with open(os.path.realpath(buffer_or_path), "rb") as f:
-                response = self._session.put(
-                    upload_url,
-                    f.read(),
-                    headers={"x-ms-blob-type": "BlockBlob"}
-                )
+            self._raise_for_status(response)
+            return
+
+        block_ids = []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = set()
+            while len(block) > 0:
+                # limit the number of blocks in memory
+                if len(pending) >= max_workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+                block_id = _get_block_id(len(block_ids))
+                block_ids.append(block_id)
+                pending.add(executor.submit(self._put_block, upload_url, block_id, block))
+                block, next_block = next_block, _read_block(buffer, block_size)
+            for future in pending:
+                future.result()
+
+        response = self._request(
+            "put",
+            upload_url,
+            data=_get_block_list_body(block_ids),
+            params=dict(comp="blocklist")
+        )
         self._raise_for_status(response)
 
+    def _put_block(self, upload_url, block_id, block):
+        # retried on its own by the retry policy
+        response = self._request(
+            "put",
+            upload_url,
+            data=block,
+            params=dict(comp="block", blockid=block_id)
+        )
+        self._raise_for_status(response)
+
+
+def _get_projection_params(params, fields, exclude):
+    """
+    Adds sparse fieldsets parameters (comma separated field names) to query parameters.
+    """
+    if fields is None and exclude is None:
+        return params
+    params = dict() if params is None else dict(params)
+    if fields is not None:
+        params["fields"] = ",".join(fields)
+    if exclude is not None:
+        params["exclude"] = ",".join(exclude)
+    return params
+
+
+def _get_one_and_only_one(records_list):
+    if len(records_list) == 1:
+        return records_list[0]
+    if len(records_list) == 0:
+        raise RecordNotFoundError("Did not find any record matching given conditions.")
+    list_str = "\t" + "\n\t".join([str(r) for r in records_list])
+    raise MultipleRecordsFoundError(
+        f"{len(records_list)} records matching given conditions where returned instead of one :\n{list_str}")
+
+
+def _raise_for_status_code(status_code, text):
+    if status_code // 100 == 4:
+        try:
+            data = json.loads(text)
+        except Exception:
+            pass
+        else:
+            if "errors" in data:
+                error_msg = "\n"
+                for key, errors_l in data["errors"].items():
+                    error_msg += f"{key}:\n"
+                    for error in errors_l:
+                        error_msg += textwrap.indent(f"{error['detailed_code']}: {error['message']}", "  ") + "\n"
+                raise HttpClientError(error_msg)
+        raise HttpClientError(f"{status_code}: {text}", status_code=status_code)
+    elif status_code // 100 >= 5:
+        raise HttpServerError(f"{status_code}: {text}")
+
+
+def create_session(pool_connections=DEFAULT_POOL_CONNECTIONS, pool_maxsize=DEFAULT_POOL_MAXSIZE):
+    """
+    Create a session whose connection pools may be shared by several clients.
+
+    Parameters
+    ----------
+    pool_connections: int
+        number of hosts for which a connection pool is kept
+    pool_maxsize: int
+        maximum number of connections kept in each host pool
+
+    Returns
+    -------
+    requests.Session
+    """
+    session = requests.Session()
+    for prefix in ("https://", "http://"):
+        session.mount(prefix, HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize))
+    return session
+
+
+def _get_block_id(block_index):
+    # all block ids of a blob must have the same length
+    return base64.b64encode(f"{block_index:08d}".encode("utf-8")).decode("utf-8")
+
+
+def _get_block_list_body(block_ids):
+    block_list = "".join(f"<Latest>{block_id}</Latest>" for block_id in block_ids)
+    return f'<?xml version="1.0" encoding="utf-8"?><BlockList>{block_list}</BlockList>'.encode("utf-8")
+
+
+def _read_block(buffer, block_size):
+    block = buffer.read(block_size)
+    if isinstance(block, str):
+        block = block.encode("utf-8")
+    return block
+
 
 class _JWTAuth(AuthBase):
-    def __init__(self, refresh_token, base_url):
+    def __init__(
+            self,
+            refresh_token,
+            base_url,
+            session,
+            refresh_margin=DEFAULT_TOKEN_REFRESH_MARGIN,
+            timeout=DEFAULT_TIMEOUT,
+            token_cache=None
+    ):
         self._token_url = f"{base_url.strip('/')}/oteams/token/refresh"
+        self._session = session
+        self._refresh_margin = dt.timedelta(seconds=refresh_margin)
+        self._timeout = timeout
+        self._lock = threading.Lock()
+        self._token_cache = token_cache
+        self._token_cache_key = TokenCache.get_key(refresh_token, base_url.strip("/"))
         self._refresh_token = refresh_token
         self._refresh_token_exp = self._get_token_exp(refresh_token)
         self._access_token, self._access_token_exp = self._get_access_token()
@@ -173,16 +436,43 @@ class _JWTAuth(AuthBase):
     def __call__(self, r):
         # no authentication for blobs
         if not "blob.core.windows.net" in r.url:
-            if self._access_token_exp - dt.datetime.utcnow() < dt.timedelta(seconds=1):
-                self._access_token, self._access_token_exp = self._get_access_token()
-            r.headers["Authorization"] = f"Bearer {self._access_token}"
+            r.headers["Authorization"] = f"Bearer {self._get_valid_access_token()}"
         return r
 
+    def _access_token_expires_soon(self):
+        return self._access_token_exp - dt.datetime.utcnow() < self._refresh_margin
+
+    def _get_valid_access_token(self):
+        if self._access_token_expires_soon():
+            # only one thread refreshes the token, the others wait for it
+            with self._lock:
+                if self._access_token_expires_soon():
+                    self._access_token, self._access_token_exp = self._get_access_token()
+        return self._access_token
+
     def _get_access_token(self):
+        if self._token_cache is None:
+            return self._request_access_token()
+        # lock is held while requesting a new token, so that concurrent processes only request it once
+        with self._token_cache.lock():
+            token = self._token_cache.get(self._token_cache_key)
+            if token is not None:
+                try:
+                    token_exp = self._get_token_exp(token)
+                except (InvalidToken, KeyError):
+                    pass
+                else:
+                    if token_exp - dt.datetime.utcnow() >= self._refresh_margin:
+                        return token, token_exp
+            token, token_exp = self._request_access_token()
+            self._token_cache.set(self._token_cache_key, token, self._get_token_exp)
+        return token, token_exp
+
+    def _request_access_token(self):
         # check if token expired
         if self._refresh_token_exp - dt.datetime.utcnow() < dt.timedelta(seconds=1):
             raise InvalidToken("Api token expired.")
-        r = requests.post(self._token_url, json=dict(refresh=self._refresh_token))
+        r = self._session.post(self._token_url, json=dict(refresh=self._refresh_token), timeout=self._timeout)
         if r.status_code == 401:
             raise InvalidToken("Api token was refused by the server.")
         r.raise_for_status()
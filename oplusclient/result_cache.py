@@ -0,0 +1,272 @@
+import os
+import io
+import json
+import uuid
+import shutil
+import hashlib
+import logging
+import threading
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401 (parquet engine)
+except ImportError:
+    pyarrow = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_MAX_SIZE = 2 * 1024 ** 3  # bytes
+
+FRAME_EXTENSIONS = (".parquet", ".npz")
+BYTES_EXTENSION = ".bin"
+
+
+class ResultCache:
+    def __init__(self, cache_dir, max_size=DEFAULT_CACHE_MAX_SIZE):
+        """
+        On-disk cache of simulation results. Entries are files named after their key; the least recently used ones
+        are removed when the cache size exceeds max_size.
+
+        Dataframes are stored as parquet files if pyarrow is installed, else as numpy files (read without pickle, so
+        only frames of numbers, booleans, datetimes and strings are stored). The cache directory is created readable by
+        its owner only.
+
+        Parameters
+        ----------
+        cache_dir: str
+            cache directory (for example ~/.oplusclient/results)
+        max_size: int
+            maximum size of the cache, in bytes
+        """
+        self.cache_dir = os.path.realpath(os.path.expanduser(cache_dir))
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+
+    @staticmethod
+    def get_key(*parts):
+        return hashlib.sha256("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+
+    def get_frame(self, key):
+        """
+        Returns
+        -------
+        pd.DataFrame or None
+        """
+        for extension in FRAME_EXTENSIONS:
+            path = self._get_path(key, extension)
+            if not self._touch(path):
+                continue
+            try:
+                if extension == ".parquet":
+                    return pd.read_parquet(path)
+                return _read_npz_frame(path)
+            except Exception as e:  # corrupted or removed entry: behaves as a miss
+                logger.warning(f"could not read cache entry {path} ({e}), ignoring it")
+                return None
+        return None
+
+    def set_frame(self, key, df):
+        if pyarrow is not None:
+            buffer = io.BytesIO()
+            try:
+                df.to_parquet(buffer)
+            except (ValueError, TypeError) as e:  # parquet does not support all frames (non str columns, ...)
+                logger.debug(f"could not store frame as parquet ({e}), storing it as numpy arrays")
+            else:
+                self._write(key, ".parquet", lambda f: f.write(buffer.getvalue()))
+                return
+        arrays = _get_frame_arrays(df)
+        if arrays is None:
+            logger.debug("frame can't be stored without pickle, it is not cached")
+            return
+        self._write(key, ".npz", lambda f: np.savez(f, **arrays))
+
+    def get_bytes(self, key, buffer_or_path=None):
+        """
+        Parameters
+        ----------
+        key: str
+        buffer_or_path: buffer or path where to write the content (if None, returns bytes)
+
+        Returns
+        -------
+        bytes or int or None
+            None if key is not in cache, else content if buffer_or_path is None, else number of bytes written
+        """
+        path = self._get_path(key, BYTES_EXTENSION)
+        if not self._touch(path):
+            return None
+        try:
+            return _read_file(path, buffer_or_path)
+        except FileNotFoundError:  # evicted meanwhile
+            return None
+
+    def set_bytes(self, key, content):
+        self._write(key, BYTES_EXTENSION, lambda f: f.write(content))
+
+    def fetch_file(self, key, write, buffer_or_path=None):
+        """
+        Returns cached content, or content written once by a function (then stored if it fits in the cache), without
+        holding it in memory.
+
+        Parameters
+        ----------
+        key: str
+        write: callable
+            called with a binary file on a cache miss, must write the content in it
+        buffer_or_path: buffer or path where to write the content (if None, returns bytes)
+
+        Returns
+        -------
+        bytes or int
+            content if buffer_or_path is None, else number of bytes written
+        """
+        cached = self.get_bytes(key, buffer_or_path=buffer_or_path)
+        if cached is not None:
+            return cached
+        return self._write(key, BYTES_EXTENSION, write, read=lambda path: _read_file(path, buffer_or_path))
+
+    def clear(self):
+        for name in os.listdir(self.cache_dir):
+            _remove(os.path.join(self.cache_dir, name))
+
+    def _get_path(self, key, extension):
+        return os.path.join(self.cache_dir, f"{key}{extension}")
+
+    @staticmethod
+    def _touch(path):
+        # access time is tracked with the modification time (access times are often disabled)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def _write(self, key, extension, write, read=None):
+        # written next to its final path then renamed, so that readers never see partial entries
+        # read is called with the written file before it is stored (or dropped if too big), its result is returned
+        path = self._get_path(key, extension)
+        temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(temp_path, "wb") as f:
+                write(f)
+            result = None if read is None else read(temp_path)
+            if os.path.getsize(temp_path) > self.max_size:
+                return result
+            os.replace(temp_path, path)
+        finally:
+            _remove(temp_path)
+        self._evict()
+        return result
+
+    def _evict(self):
+        with self._lock:
+            entries = []
+            for entry in os.scandir(self.cache_dir):
+                if entry.name.endswith(".tmp"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+            size = sum(e[1] for e in entries)
+            for _, entry_size, path in sorted(entries):
+                if size <= self.max_size:
+                    break
+                _remove(path)
+                size -= entry_size
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _read_file(path, buffer_or_path):
+    with open(path, "rb") as f:
+        if buffer_or_path is None:
+            return f.read()
+        if hasattr(buffer_or_path, "write"):
+            shutil.copyfileobj(f, buffer_or_path)
+        else:
+            with open(buffer_or_path, "wb") as target:
+                shutil.copyfileobj(f, target)
+    return os.path.getsize(path)
+
+
+def _get_array(values):
+    """
+    Returns
+    -------
+    (np.ndarray, np.ndarray or None) or None
+        values and missing values mask of object values (stored as strings), None if values can't be stored without
+        pickle
+    """
+    array = np.asarray(values)
+    if array.dtype.kind in "biufcmM":
+        return array, None
+    if array.dtype.kind != "O":
+        return None
+    mask = pd.isna(array)
+    if not all(isinstance(v, str) for v in array[~mask]):
+        return None
+    return np.where(mask, "", array).astype(str), mask
+
+
+def _get_frame_arrays(df):
+    """
+    Returns
+    -------
+    dict or None
+        arrays to store with np.savez, None if frame can't be stored without pickle
+    """
+    if isinstance(df.index, pd.MultiIndex) or isinstance(df.columns, pd.MultiIndex):
+        return None
+    columns = df.columns.tolist()
+    if not all(isinstance(c, (str, int)) for c in columns):
+        return None
+    if not all(n is None or isinstance(n, str) for n in (df.index.name, df.columns.name)):
+        return None
+    arrays = dict()
+    for name, values in [("index", df.index)] + [(f"c{i}", df.iloc[:, i]) for i in range(len(columns))]:
+        array_and_mask = _get_array(values)
+        if array_and_mask is None:
+            return None
+        arrays[name], mask = array_and_mask
+        if mask is not None:
+            arrays[f"{name}_mask"] = mask
+    meta = dict(columns=columns, columns_name=df.columns.name, index_name=df.index.name)
+    if isinstance(df.index, pd.RangeIndex):
+        meta["range_index"] = [df.index.start, df.index.stop, df.index.step]
+        del arrays["index"]
+    arrays["meta"] = np.array(json.dumps(meta))
+    return arrays
+
+
+def _read_npz_frame(path):
+    with np.load(path, allow_pickle=False) as npz:
+        meta = json.loads(str(npz["meta"]))
+
+        def get_values(name):
+            array = npz[name]
+            if f"{name}_mask" in npz:
+                array = array.astype(object)
+                array[npz[f"{name}_mask"]] = np.nan
+            return array
+
+        if "range_index" in meta:
+            index = pd.RangeIndex(*meta["range_index"], name=meta["index_name"])
+        else:
+            index = pd.Index(get_values("index"), name=meta["index_name"])
+        df = pd.DataFrame(
+            {i: get_values(f"c{i}") for i in range(len(meta["columns"]))},
+            index=index
+        )
+    df.columns = pd.Index(meta["columns"], name=meta["columns_name"])
+    return df
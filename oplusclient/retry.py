@@ -0,0 +1,123 @@
+import datetime as dt
+import email.utils
+import logging
+import random
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class RetryPolicy:
+    def __init__(
+            self,
+            max_attempts=5,
+            backoff_factor=0.5,
+            max_backoff=30,
+            max_retry_after=300,
+            jitter=True,
+            retry_statuses=(429, 502, 503, 504),
+            idempotent_methods=("GET", "HEAD", "OPTIONS", "PUT", "DELETE"),
+            retry_non_idempotent=False
+    ):
+        """
+        Parameters
+        ----------
+        max_attempts: int
+            maximum number of times a request is sent (1 disables retries)
+        backoff_factor: float
+            delay before the first retry, in seconds, doubled at each new attempt
+        max_backoff: float
+            maximum delay between two attempts, in seconds (a Retry-After header sent by the server prevails)
+        max_retry_after: float
+            maximum delay requested by a Retry-After header that is honored, in seconds (longer delays are capped)
+        jitter: bool
+            if True, delays are randomly drawn between 0 and the exponential backoff value
+        retry_statuses: tuple of int
+            response status codes that lead to a retry
+        idempotent_methods: tuple of str
+            http methods that are retried
+        retry_non_idempotent: bool
+            if True, all methods are retried (including POST)
+        """
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+        self.jitter = jitter
+        self.retry_statuses = frozenset(retry_statuses)
+        self.idempotent_methods = frozenset(m.upper() for m in idempotent_methods)
+        self.retry_non_idempotent = retry_non_idempotent
+        self._retry_count = 0
+        self._lock = threading.Lock()
+
+    @property
+    def retry_count(self):
+        """
+        Number of retries performed since the policy was created.
+        """
+        return self._retry_count
+
+    def can_retry(self, method, attempt):
+        """
+        Parameters
+        ----------
+        method: str
+        attempt: int
+            number of attempts already performed
+
+        Returns
+        -------
+        bool
+        """
+        if attempt >= self.max_attempts:
+            return False
+        return self.retry_non_idempotent or method.upper() in self.idempotent_methods
+
+    def is_retryable_status(self, status_code):
+        return status_code in self.retry_statuses
+
+    def get_delay(self, attempt, headers=None):
+        """
+        Parameters
+        ----------
+        attempt: int
+            number of attempts already performed
+        headers: mapping or None
+            headers of the failed response, if any
+
+        Returns
+        -------
+        float
+            number of seconds to wait before next attempt
+        """
+        if headers is not None:
+            retry_after = _parse_retry_after(headers.get("Retry-After"))
+            if retry_after is not None:
+                return min(self.max_retry_after, retry_after)
+        delay = min(self.max_backoff, self.backoff_factor * 2 ** (attempt - 1))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    def register_retry(self, method, url, reason):
+        with self._lock:
+            self._retry_count += 1
+        logger.warning(f"{method.upper()} {url.split('?')[0]} failed ({reason}), retrying")
+
+
+def _parse_retry_after(value):
+    if value is None:
+        return None
+    try:
+        return max(0., float(value))
+    except ValueError:
+        pass
+    try:
+        retry_date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_date is None:
+        return None
+    if retry_date.tzinfo is not None:
+        retry_date = retry_date.astimezone(dt.timezone.utc).replace(tzinfo=None)
+    return max(0., (retry_date - dt.datetime.utcnow()).total_seconds())
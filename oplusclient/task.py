@@ -1,4 +1,13 @@
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .exceptions import TaskTimeoutError
+from .rest_client import DEFAULT_MAX_WORKERS
+
+# polling starts every DEFAULT_PERIOD ms, then the period is multiplied by DEFAULT_BACKOFF until DEFAULT_MAX_PERIOD ms
+DEFAULT_PERIOD = 200
+DEFAULT_MAX_PERIOD = 5000
+DEFAULT_BACKOFF = 1.5
 
 
 class Task:
@@ -65,22 +74,163 @@ class Task:
             self.reload()
         return self._response["message"]
 
-    def wait_for_completion(self, period=200):
+    def wait_for_completion(
+            self,
+            period=DEFAULT_PERIOD,
+            max_period=DEFAULT_MAX_PERIOD,
+            backoff=DEFAULT_BACKOFF,
+            timeout=None
+    ):
         """
         Method to reload data until task finishes.
 
         Parameters
         ----------
         period  : int
-            Number of milliseconds between successive data reloads.
+            Number of milliseconds between the first successive data reloads.
+        max_period : int
+            Maximum number of milliseconds between successive data reloads.
+        backoff : float
+            Factor applied to the period after each reload.
+        timeout : float or None
+            Maximum number of seconds to wait for.
 
         Returns
         -------
         bool
           Task success state as indicated by the status code.
+
+        Raises
+        ------
+        TaskTimeoutError
         """
-        ms = 1e-3 * period
-        while not self._response["finished"]:
+        start = time.monotonic()
+        for delay in iter_poll_delays(period=period, max_period=max_period, backoff=backoff):
             self.reload()
-            time.sleep(ms)
+            if self._response["finished"]:
+                break
+            _sleep_before_timeout(delay, start, timeout)
         return self._response["status_code"] == 200
+
+
+def iter_poll_delays(period=DEFAULT_PERIOD, max_period=DEFAULT_MAX_PERIOD, backoff=DEFAULT_BACKOFF):
+    """
+    Infinite iterator of delays (in seconds) between successive polls: fast at first, then growing until max_period.
+
+    Parameters
+    ----------
+    period  : int
+        Number of milliseconds of the first delay.
+    max_period : int
+        Maximum number of milliseconds of a delay.
+    backoff : float
+        Factor applied to the delay after each poll.
+    """
+    ms = period
+    while True:
+        yield 1e-3 * ms
+        ms = min(max_period, ms * backoff)
+
+
+def _sleep_before_timeout(delay, start, timeout):
+    if timeout is not None:
+        remaining = timeout - (time.monotonic() - start)
+        if remaining <= 0:
+            raise TaskTimeoutError(f"Timeout reached ({timeout}s).")
+        delay = min(delay, remaining)
+    time.sleep(delay)
+
+
+def as_completed(
+        tasks,
+        period=DEFAULT_PERIOD,
+        max_period=DEFAULT_MAX_PERIOD,
+        backoff=DEFAULT_BACKOFF,
+        timeout=None
+):
+    """
+    Iterate through tasks as they finish.
+
+    At each poll, all unfinished tasks are reloaded with one list request if the server supports filtering tasks by
+    ids, else with concurrent retrieve requests.
+
+    Parameters
+    ----------
+    tasks : list of Task
+        Tasks must share the same client.
+    period  : int
+        Number of milliseconds between the first successive polls.
+    max_period : int
+        Maximum number of milliseconds between successive polls.
+    backoff : float
+        Factor applied to the period after each poll.
+    timeout : float or None
+        Maximum number of seconds to wait for.
+
+    Returns
+    -------
+    typing.Iterator of Task
+
+    Raises
+    ------
+    TaskTimeoutError
+    """
+    pending = list(tasks)
+    start = time.monotonic()
+    ids_filter = None  # True if the server filters tasks by ids, None if unknown
+    with ThreadPoolExecutor(max_workers=DEFAULT_MAX_WORKERS) as executor:
+        for delay in iter_poll_delays(period=period, max_period=max_period, backoff=backoff):
+            # reload
+            to_reload = [t for t in pending if not t._response["finished"]]
+            if len(to_reload) > 0 and ids_filter is not False:
+                ids_filter = _reload_with_ids_filter(to_reload)
+            if len(to_reload) > 0 and not ids_filter:
+                for _ in executor.map(Task.reload, to_reload):
+                    pass
+
+            # yield finished tasks
+            for t in [t for t in pending if t._response["finished"]]:
+                pending.remove(t)
+                yield t
+            if len(pending) == 0:
+                break
+            _sleep_before_timeout(delay, start, timeout)
+
+
+def wait_all(
+        tasks,
+        period=DEFAULT_PERIOD,
+        max_period=DEFAULT_MAX_PERIOD,
+        backoff=DEFAULT_BACKOFF,
+        timeout=None
+):
+    """
+    Wait until all tasks are finished (see as_completed).
+
+    Returns
+    -------
+    list of bool
+        Tasks success states, in the order of tasks.
+    """
+    for _ in as_completed(tasks, period=period, max_period=max_period, backoff=backoff, timeout=timeout):
+        pass
+    return [t._response["status_code"] == 200 for t in tasks]
+
+
+def _reload_with_ids_filter(tasks):
+    """
+    Returns False if the server did not filter the tasks by ids (tasks are not reloaded then).
+    """
+    tasks_by_id = {t._task_id: t for t in tasks}
+    records_data = tasks[0]._client.list(
+        Task.route,
+        params=dict(id__in=",".join(tasks_by_id), length=len(tasks_by_id))
+    )["data"]
+    if (
+            len(records_data) != len(tasks_by_id) or
+            any(data.get("id") not in tasks_by_id or "finished" not in data for data in records_data)
+    ):
+        return False
+    for data in records_data:
+        tasks_by_id[data["id"]]._response = data
+    return True
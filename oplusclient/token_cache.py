@@ -0,0 +1,86 @@
+import os
+import json
+import hashlib
+import datetime as dt
+import contextlib
+
+try:
+    import fcntl
+except ImportError:  # windows: cache is not locked
+    fcntl = None
+
+
+class TokenCache:
+    def __init__(self, path):
+        """
+        On-disk cache of access tokens, shared by processes using the same api token and base url.
+
+        Parameters
+        ----------
+        path: str
+            path of the cache file (for example ~/.oplusclient/token_cache.json), only readable by its owner
+        """
+        self.path = os.path.realpath(os.path.expanduser(path))
+
+    @staticmethod
+    def get_key(refresh_token, base_url):
+        return hashlib.sha256(f"{base_url}|{refresh_token}".encode("utf-8")).hexdigest()
+
+    @contextlib.contextmanager
+    def lock(self):
+        """
+        Exclusive lock on the cache, held across processes.
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(f"{self.path}.lock", "a") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def get(self, key):
+        """
+        Must be called while holding the lock.
+
+        Returns
+        -------
+        str or None
+        """
+        return self._read().get(key)
+
+    def set(self, key, token, get_token_exp):
+        """
+        Must be called while holding the lock. Expired tokens are removed from the cache.
+
+        Parameters
+        ----------
+        key: str
+        token: str
+        get_token_exp: callable
+            returns the expiry (naive utc datetime) of a token
+        """
+        now = dt.datetime.utcnow()
+        tokens = {k: v for k, v in self._read().items() if _is_valid(v, get_token_exp, now)}
+        tokens[key] = token
+        tmp_path = f"{self.path}.tmp"
+        with os.fdopen(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as f:
+            json.dump(tokens, f)
+        os.replace(tmp_path, self.path)
+
+    def _read(self):
+        try:
+            with open(self.path) as f:
+                tokens = json.load(f)
+        except (OSError, ValueError):
+            return dict()
+        return tokens if isinstance(tokens, dict) else dict()
+
+
+def _is_valid(token, get_token_exp, now):
+    try:
+        return get_token_exp(token) > now
+    except Exception:
+        return False
@@ -1 +1 @@
-version = "1.8.3"
+version = "1.9.0"
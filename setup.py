@@ -18,6 +18,7 @@ setup(
     author_email="contact@openergy.fr",
     long_description=open("README.md").read(),
     install_requires=requirements,
+    extras_require={"async": ["aiohttp>=3.7,<4"]},
     url=f"https://github.com/openergy/{REPO_AND_PACKAGE_NAME}",
     classifiers=[
         "Programming Language :: Python",
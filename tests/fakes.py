@@ -0,0 +1,121 @@
+"""
+In-memory stand-ins of RestClient and Client, to test endpoints and models without server. Tests configure the
+records, filters, detail actions and blobs they need.
+"""
+import threading
+import time
+from urllib.parse import urlparse
+
+from oplusclient import exceptions
+from oplusclient.record_cache import RecordCache
+
+
+class FakeRestClient:
+    def __init__(self, records=None, filters=(), list_delay=None, marker_page_size=1):
+        """
+        Parameters
+        ----------
+        records: dict or None
+            route -> list of records data
+        filters: iterable of str
+            list parameters applied as equality filters (others are ignored, like an older server would)
+        list_delay: callable or None
+            called with list params, returns the number of seconds the response is delayed
+        marker_page_size: int
+            number of records of marker paginated pages (routes listed with a next_marker parameter)
+        """
+        self.records = dict() if records is None else records
+        self.filters = set(filters)
+        self.list_delay = list_delay
+        self.marker_page_size = marker_page_size
+        # action name -> callable(route, record_id, method, data, params) or returned data
+        self.detail_actions = dict()
+        # url path -> bytes, or exception raised by downloads
+        self.blobs = dict()
+        # (method, path, params or action name or url)
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def _register(self, method, path, detail=None):
+        with self._lock:
+            self.requests.append((method, path, detail))
+
+    def count(self, method, detail=None):
+        return len([r for r in self.requests if r[0] == method and (detail is None or r[2] == detail)])
+
+    def _get_record(self, path, record_id):
+        record = next((r for r in self.records.get(path, []) if r["id"] == record_id), None)
+        if record is None:
+            raise exceptions.HttpClientError(f"{path}/{record_id} not found", status_code=404)
+        return record
+
+    def list(self, path, params=None, fields=None, exclude=None):
+        params = dict() if params is None else params
+        self._register("list", path, params)
+        if self.list_delay is not None:
+            time.sleep(self.list_delay(params))
+        records = [
+            r for r in self.records.get(path, [])
+            if all(str(r.get(k)) == str(v) for k, v in params.items() if k in self.filters and v is not None)
+        ]
+        if "next_marker" in params:
+            start = int(params["next_marker"] or 0)
+            end = start + self.marker_page_size
+            next_marker = str(end) if end < len(records) else None
+            return dict(data=[_project(r, fields, exclude) for r in records[start:end]], next_marker=next_marker)
+        start = params.get("start", 0)
+        records = records[start:start + params["length"]] if "length" in params else records[start:]
+        return dict(data=[_project(r, fields, exclude) for r in records])
+
+    def retrieve(self, path, record_id, params=None, fields=None, exclude=None):
+        self._register("retrieve", path, record_id)
+        return _project(self._get_record(path, record_id), fields, exclude)
+
+    def partial_update(self, path, record_id, data):
+        self._register("partial_update", path, record_id)
+        record = self._get_record(path, record_id)
+        record.update(data)
+        return dict(record)
+
+    def delete(self, path, record_id):
+        self._register("delete", path, record_id)
+        self.records[path].remove(self._get_record(path, record_id))
+
+    def detail_action(self, path, record_id, action_name, method="get", data=None, params=None):
+        self._register("detail_action", path, action_name)
+        action = self.detail_actions.get(action_name, dict())
+        if callable(action):
+            return action(path, record_id, method, data, params)
+        return action
+
+    def download(self, download_url, buffer_or_path=None, **kwargs):
+        self._register("download", download_url)
+        content = self.blobs.get(urlparse(download_url).path)
+        if content is None:
+            raise exceptions.HttpClientError(f"{download_url} not found", status_code=404)
+        if isinstance(content, Exception):
+            raise content
+        if callable(content):
+            content = content()
+        if buffer_or_path is None:
+            return content
+        if hasattr(buffer_or_path, "write"):
+            buffer_or_path.write(content)
+        else:
+            with open(buffer_or_path, "wb") as f:
+                f.write(content)
+        return len(content)
+
+
+class FakeClient:
+    def __init__(self, rest_client=None, record_cache_ttl=0, result_cache=None):
+        self.rest_client = FakeRestClient() if rest_client is None else rest_client
+        self.record_cache = RecordCache(ttl=record_cache_ttl)
+        self.result_cache = result_cache
+
+
+def _project(data, fields, exclude):
+    return {
+        k: v for k, v in data.items()
+        if (fields is None or k in fields) and (exclude is None or k not in exclude)
+    }
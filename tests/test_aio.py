@@ -0,0 +1,153 @@
+import asyncio
+import json
+import threading
+import unittest
+from urllib.parse import urlparse, parse_qs
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from oplusclient.retry import RetryPolicy
+from tests.test_rest_client import _BlobStandInHandler, _ThreadingHTTPServer, make_token
+
+ROUTE = "ossweather/weathers"
+
+
+class _ApiStandInHandler(_BlobStandInHandler):
+    """
+    Blob stand-in also serving a records route (offset paging, retrieve, partial update, delete and detail actions).
+    """
+    def _get_record(self, record_id):
+        return next((r for r in self.server.records if r["id"] == record_id), None)
+
+    def _send_json(self, data):
+        self._send(200, json.dumps(data).encode("utf-8"))
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = url.path.strip("/").split("/")
+        if url.path == f"/{ROUTE}":
+            self.server.list_requests += 1
+            query = parse_qs(url.query)
+            self.server.list_queries.append(query)
+            start = int(query.get("start", [0])[0])
+            length = int(query.get("length", [0])[0])
+            self._send_json(dict(data=self.server.records[start:start + length]))
+        elif url.path.startswith(f"/{ROUTE}/") and len(parts) == 3:
+            self._send_json(self._get_record(parts[2]))
+        elif url.path.startswith(f"/{ROUTE}/") and parts[3] == "blob_url":
+            self._send_json(dict(blob_url=f"http://{self.headers['Host']}/container/{parts[2]}?sig=token"))
+        else:
+            super().do_GET()
+
+    def do_PATCH(self):
+        record = self._get_record(urlparse(self.path).path.strip("/").split("/")[2])
+        record.update(json.loads(self._read_body()))
+        self._send_json(record)
+
+    def do_DELETE(self):
+        record = self._get_record(urlparse(self.path).path.strip("/").split("/")[2])
+        self.server.records.remove(record)
+        self._send(204)
+
+
+@unittest.skipIf(aiohttp is None, "aiohttp is not installed")
+class TestAsyncClient(unittest.TestCase):
+    def setUp(self):
+        self.server = _ThreadingHTTPServer(("127.0.0.1", 0), _ApiStandInHandler)
+        self.server.blobs = {}
+        self.server.failures = {}
+        self.server.token_refreshes = 0
+        self.server.list_requests = 0
+        self.server.list_queries = []
+        self.server.records = [dict(id=f"r{i}", name=f"record {i}") for i in range(7)]
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _run(self, coroutine_function):
+        from oplusclient.aio import AsyncClient
+
+        async def run():
+            async with AsyncClient(
+                    api_token=make_token(),
+                    base_url=self.base_url,
+                    retry_policy=RetryPolicy(backoff_factor=0.01)
+            ) as client:
+                return await coroutine_function(client)
+        return asyncio.run(run())
+
+    def test_iter_pages(self):
+        async def iter_ids(client, prefetch):
+            return [r.id async for r in client.weather.iter(page_size=3, prefetch=prefetch)]
+
+        expected = [f"r{i}" for i in range(7)]
+        self.assertEqual(expected, self._run(lambda client: iter_ids(client, 0)))
+        self.assertEqual(3, self.server.list_requests)
+        self.assertEqual(expected, self._run(lambda client: iter_ids(client, 2)))
+
+    def test_iter_is_not_capped_with_prefetch(self):
+        async def count(client, prefetch):
+            client.weather.MAX_ITERATIONS = 3
+            return len([r async for r in client.weather.iter(page_size=1, prefetch=prefetch)])
+
+        self.assertEqual(7, self._run(lambda client: count(client, 1)))
+        with self.assertRaises(RuntimeError):
+            self._run(lambda client: count(client, 0))
+
+    def test_list_params_are_repeated(self):
+        async def list_ids(client):
+            records = await client.weather.list(
+                limit=3,
+                extra_params=dict(tag=["a", "b"], name=None, variant=("c",), detailed=True)
+            )
+            return [r.id for r in records]
+
+        self.assertEqual(["r0", "r1", "r2"], self._run(list_ids))
+        self.assertEqual(
+            dict(tag=["a", "b"], variant=["c"], detailed=["True"], length=["3"]),
+            self.server.list_queries[0]
+        )
+
+    def test_iter_rejects_empty_pages(self):
+        async def iter_records(client):
+            return [r async for r in client.weather.iter(page_size=0)]
+
+        with self.assertRaises(ValueError):
+            self._run(iter_records)
+
+    def test_records_only_hold_data(self):
+        from oplusclient.aio import AsyncRecord
+
+        async def retrieve(client):
+            return await client.weather.retrieve("r1")
+
+        record = self._run(retrieve)
+        self.assertIsInstance(record, AsyncRecord)
+        self.assertEqual("record 1", record.name)
+        self.assertEqual("<AsyncRecord: record 1 (r1)>", repr(record))
+        self.assertFalse(hasattr(record, "reload"))
+        self.assertFalse(hasattr(record, "update"))
+
+    def test_update_and_delete_with_records(self):
+        async def update_and_delete(client):
+            record = await client.weather.retrieve("r1")
+            updated = await client.weather.update(record, name="renamed")
+            await client.weather.delete(updated)
+            return updated
+
+        updated = self._run(update_and_delete)
+        self.assertEqual("renamed", updated.name)
+        self.assertEqual(["r0", "r2", "r3", "r4", "r5", "r6"], [r["id"] for r in self.server.records])
+
+    def test_download(self):
+        async def download(client):
+            return await client.weather.download(await client.weather.retrieve("r2"))
+
+        self.server.blobs["/container/r2"] = b"content"
+        self.assertEqual(b"content", self._run(download))
@@ -0,0 +1,30 @@
+import unittest
+
+from oplusclient.models import Simulation
+from oplusclient.models.base import get_compact_model_cls
+
+
+class _Endpoint:
+    route = "osssimulations/multi_simulation_groups/id/simulations"
+    client = None
+
+
+class CompactRecordTest(unittest.TestCase):
+    def test_compact_record(self):
+        data = dict(id="id", name="name", status="success")
+        simulation = get_compact_model_cls(Simulation, tuple(data))(_Endpoint(), data)
+        self.assertIsInstance(simulation, Simulation)
+        self.assertEqual("success", simulation.status)
+        self.assertEqual(data, simulation.data)
+        self.assertFalse(hasattr(simulation, "logs"))
+
+    def test_classes_are_shared(self):
+        fields = ("id", "name")
+        self.assertIs(get_compact_model_cls(Simulation, fields), get_compact_model_cls(Simulation, fields))
+
+    def test_data_fields_change(self):
+        data = dict(id="id", name="name")
+        simulation = get_compact_model_cls(Simulation, tuple(data))(_Endpoint(), data)
+        simulation.data = dict(id="id", name="name", status="running")
+        self.assertEqual("running", simulation.status)
+        self.assertEqual(("id", "name", "status"), simulation._fields)
@@ -0,0 +1,23 @@
+import unittest
+
+from oplusclient.frames import build_frame
+
+
+class BuildFrameTest(unittest.TestCase):
+    def test_build_frame(self):
+        pages_data = [
+            [dict(id="a", status="success", start="2019-01-01T00:00:00", logs="..."), dict(id="b", status="failed")],
+            [],
+            [dict(id="c", status="success", start="2019-01-02T00:00:00")]
+        ]
+        df = build_frame(pages_data, columns=["status", "start"], dtypes=dict(status="category"), parse_dates=["start"])
+        self.assertEqual(["a", "b", "c"], df.index.tolist())
+        self.assertEqual(["status", "start"], df.columns.tolist())
+        self.assertEqual("category", df["status"].dtype.name)
+        self.assertEqual("datetime64[ns]", df["start"].dtype.name)
+        self.assertTrue(df.loc["b", "start"] != df.loc["b", "start"])  # NaT
+
+    def test_empty(self):
+        df = build_frame([[]], columns=["name"])
+        self.assertEqual(0, len(df))
+        self.assertEqual(["name"], df.columns.tolist())
@@ -0,0 +1,106 @@
+import json
+import time
+import unittest
+import datetime as dt
+
+from oplusclient import exceptions
+from oplusclient.endpoints.base import BaseEndpoint
+from oplusclient.models import Simulation
+from tests.fakes import FakeClient, FakeRestClient
+
+SIMULATIONS_ROUTE = "osssimulations/simulation_groups/group/simulations"
+SAS_TOKEN = "se=2099-01-01T00%3A00%3A00Z&sig=token"
+
+
+def _get_simulation(series_nb, series_delay=0):
+    rest_client = FakeRestClient(records={SIMULATIONS_ROUTE: [dict(id="id", status="success")]})
+    rest_client.detail_actions["generic_viz"] = dict(container_url="https://blobs/container/", sas_token=SAS_TOKEN)
+    series = [
+        dict(id=f"s{i}", topic="zone", name=f"series {i}", ozg=None, azg=None, zone="z", unit="C", energy_type=None,
+             energy_category=None, use=None)
+        for i in range(series_nb)
+    ]
+    rest_client.blobs["/container/metadata.json"] = json.dumps(dict(years=[2019], series=series)).encode("utf-8")
+    rest_client.blobs["/container/2019/index.json"] = json.dumps(
+        ["2019-01-01T00:00:00.000Z", "2019-01-01T01:00:00.000Z"]
+    ).encode("utf-8")
+
+    def get_series(i):
+        time.sleep(series_delay)
+        return json.dumps([i, i + 0.5]).encode("utf-8")
+
+    for i in range(series_nb):
+        rest_client.blobs[f"/container/2019/s{i}.json"] = lambda i=i: get_series(i)
+    simulation = BaseEndpoint(FakeClient(rest_client), SIMULATIONS_ROUTE, Simulation).data_to_record(
+        dict(id="id", status="success")
+    )
+    return simulation, rest_client
+
+
+class OutHourlyTest(unittest.TestCase):
+    def test_series(self):
+        simulation, rest_client = _get_simulation(3)
+        df = simulation.get_out_hourly(series_ids=["s2", "s0"])
+        self.assertEqual(["s2", "s0"], df.columns.tolist())
+        self.assertEqual([2., 2.5], df["s2"].tolist())
+        self.assertEqual(2, len(df.index))
+
+    def test_missing_series_cancels_pending_downloads(self):
+        simulation, rest_client = _get_simulation(20, series_delay=0.05)
+        series_ids = [f"s{i}" for i in range(20)]
+        series_ids.insert(1, "unknown")
+        with self.assertRaises(ValueError):
+            simulation.get_out_hourly(series_ids=series_ids, max_workers=2)
+        # metadata, index and series downloads started before the failure: others were cancelled
+        self.assertLess(rest_client.count("download"), 2 + len(series_ids))
+
+    def test_blob_info_is_reused(self):
+        simulation, rest_client = _get_simulation(3)
+        simulation.get_out_hourly(series_ids=["s0", "s1"])
+        simulation.get_out_hourly_columns()
+        self.assertEqual(1, rest_client.count("detail_action", "generic_viz"))
+        self.assertEqual(5, rest_client.count("download"))
+
+    def test_blob_info_is_refreshed_after_forbidden_download(self):
+        simulation, rest_client = _get_simulation(3)
+        tokens = iter(["sig=revoked", "sig=token"])
+        rest_client.detail_actions["generic_viz"] = lambda *_: dict(
+            container_url="https://blobs/container/",
+            sas_token=next(tokens)
+        )
+
+        def forbid_revoked(content):
+            def get_content():
+                # downloads are sequential (one worker): the last request is the current one
+                if rest_client.requests[-1][1].endswith("?sig=revoked"):
+                    raise exceptions.HttpClientError("forbidden", status_code=403)
+                return content() if callable(content) else content
+            return get_content
+
+        rest_client.blobs = {path: forbid_revoked(content) for path, content in rest_client.blobs.items()}
+        df = simulation.get_out_hourly(series_ids=["s0", "s1"], max_workers=1)
+        self.assertEqual([0., 0.5], df["s0"].tolist())
+        # refreshed once, then index and series are downloaded with the refreshed token
+        self.assertEqual(2, rest_client.count("detail_action", "generic_viz"))
+        self.assertEqual(5, rest_client.count("download"))
+
+    def test_blob_info_is_refreshed_when_it_expires(self):
+        simulation, rest_client = _get_simulation(3)
+        # expires within the margin: refreshed at each use
+        se = (dt.datetime.utcnow() + dt.timedelta(seconds=30)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        rest_client.detail_actions["generic_viz"] = dict(
+            container_url="https://blobs/container/",
+            sas_token=f"se={se}&sig=token"
+        )
+        simulation.get_out_hourly_columns()
+        simulation.get_out_hourly_columns()
+        self.assertEqual(2, rest_client.count("detail_action", "generic_viz"))
+
+        # without expiry, blob info is kept for a default lifetime
+        rest_client.detail_actions["generic_viz"] = dict(container_url="https://blobs/container/", sas_token="sig=a")
+        simulation._get_generic_viz_blob_info(force_refresh=True)
+        simulation.get_out_hourly_columns()
+        self.assertEqual(3, rest_client.count("detail_action", "generic_viz"))
+        simulation._generic_viz_blob_info_exp = dt.datetime.utcnow()
+        simulation.get_out_hourly_columns()
+        self.assertEqual(4, rest_client.count("detail_action", "generic_viz"))
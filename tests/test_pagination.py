@@ -0,0 +1,73 @@
+import time
+import threading
+import unittest
+
+from oplusclient.endpoints.base import BaseEndpoint
+from oplusclient.endpoints.simulation import SimulationEndpoint
+from tests.fakes import FakeClient, FakeRestClient
+
+
+GROUPS_ROUTE = "osssimulations/multi_simulation_groups"
+SIMULATIONS_ROUTE = f"{GROUPS_ROUTE}/group/simulations"
+
+
+def _get_client(records_nb):
+    # next pages are received before the first one
+    return FakeClient(FakeRestClient(
+        records={"oteams/projects": [dict(id=f"r{i}") for i in range(records_nb)]},
+        list_delay=lambda params: 0.05 if params.get("start", 0) == 0 else 0
+    ))
+
+
+def _get_simulation_endpoint(simulations_nb):
+    client = FakeClient(FakeRestClient(records={
+        GROUPS_ROUTE: [dict(id="group")],
+        SIMULATIONS_ROUTE: [dict(id=f"s{i}") for i in range(simulations_nb)]
+    }))
+    return SimulationEndpoint(client, "/simulations", BaseEndpoint(client, GROUPS_ROUTE).retrieve("group"))
+
+
+def _get_offsets(client):
+    return [params.get("start", 0) for method, _, params in client.rest_client.requests if method == "list"]
+
+
+class PaginationTest(unittest.TestCase):
+    def test_pages(self):
+        for prefetch in (0, 1, 3):
+            client = _get_client(7)
+            endpoint = BaseEndpoint(client, "oteams/projects")
+            records = list(endpoint.iter(page_size=3, prefetch=prefetch))
+            self.assertEqual([f"r{i}" for i in range(7)], [r.id for r in records])
+
+    def test_empty_pages_are_rejected(self):
+        endpoint = BaseEndpoint(_get_client(7), "oteams/projects")
+        with self.assertRaises(ValueError):
+            next(endpoint.iter(page_size=0))
+
+    def test_no_page_is_requested_after_the_last_one(self):
+        client = _get_client(4)
+        endpoint = BaseEndpoint(client, "oteams/projects")
+        iterator = endpoint.iter(page_size=3, prefetch=2)
+        records = [next(iterator) for _ in range(4)]
+        time.sleep(0.05)  # let pages requested after the first one is consumed run
+        records.extend(iterator)
+        self.assertEqual(4, len(records))
+        # page 1 is the last one: page 2 may have been requested with it, not page 3
+        self.assertNotIn(9, _get_offsets(client))
+
+    def test_simulations_pages(self):
+        for prefetch in (0, 1, 2):
+            endpoint = _get_simulation_endpoint(5)
+            records = list(endpoint.iter(prefetch=prefetch))
+            self.assertEqual([f"s{i}" for i in range(5)], [r.id for r in records])
+
+    def test_simulations_producer_stops_when_iteration_is_closed(self):
+        endpoint = _get_simulation_endpoint(100)
+        threads_nb = threading.active_count()
+        iterator = endpoint.iter(prefetch=1)
+        next(iterator)
+        time.sleep(0.05)  # producer is blocked on the full queue
+        iterator.close()
+        time.sleep(0.05)
+        self.assertEqual(threads_nb, threading.active_count())
+        self.assertLessEqual(endpoint.client.rest_client.count("list"), 4)
@@ -0,0 +1,54 @@
+import unittest
+
+from oplusclient.endpoints.base import BaseEndpoint
+from oplusclient.rest_client import _get_projection_params
+from tests.fakes import FakeClient, FakeRestClient
+
+RECORD_DATA = dict(id="id", name="name", status="success", logs="...")
+
+
+ROUTE = "osssimulations/simulation_groups"
+
+
+def _get_client():
+    return FakeClient(FakeRestClient(records={ROUTE: [dict(RECORD_DATA)]}))
+
+
+class ProjectionTest(unittest.TestCase):
+    def test_projection_params(self):
+        self.assertIsNone(_get_projection_params(None, None, None))
+        self.assertEqual(
+            dict(length=10, fields="id,name", exclude="logs"),
+            _get_projection_params(dict(length=10), ["id", "name"], ["logs"])
+        )
+
+    def test_missing_fields_are_loaded_on_access(self):
+        for compact in (False, True):
+            client = _get_client()
+            endpoint = BaseEndpoint(client, ROUTE)
+            record = endpoint.list(fields=["id", "status"], compact=compact)[0]
+            self.assertEqual(dict(id="id", status="success"), record.data)
+            self.assertEqual("...", record.logs)
+            self.assertEqual(1, client.rest_client.count("retrieve"))
+            with self.assertRaises(AttributeError):
+                record.unknown_field
+            self.assertEqual(1, client.rest_client.count("retrieve"))
+
+    def test_id_is_always_requested(self):
+        for compact in (False, True):
+            client = _get_client()
+            endpoint = BaseEndpoint(client, ROUTE)
+            record = endpoint.list(fields=["name", "status"], compact=compact)[0]
+            self.assertEqual(dict(id="id", name="name", status="success"), record.data)
+            self.assertEqual("...", record.logs)
+            self.assertEqual(1, client.rest_client.count("retrieve"))
+
+    def test_repr_and_private_lookups_do_not_load_fields(self):
+        for compact in (False, True):
+            client = _get_client()
+            endpoint = BaseEndpoint(client, ROUTE)
+            record = endpoint.list(fields=["id", "status"], compact=compact)[0]
+            self.assertEqual("<BaseModel: id>", repr(record))
+            self.assertFalse(hasattr(record, "_unknown"))
+            self.assertFalse(hasattr(record, "__unknown__"))
+            self.assertEqual(0, client.rest_client.count("retrieve"))
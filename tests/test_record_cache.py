@@ -0,0 +1,46 @@
+import time
+import unittest
+
+from oplusclient.endpoints.base import BaseEndpoint
+from oplusclient.record_cache import RecordCache
+from tests.fakes import FakeClient
+
+
+class RecordCacheTest(unittest.TestCase):
+    def test_get_set_invalidate(self):
+        cache = RecordCache(ttl=60)
+        record = object()
+        self.assertIsNone(cache.get("ossweather/weathers", "id"))
+        cache.set("ossweather/weathers", "id", record)
+        self.assertIs(record, cache.get("ossweather/weathers", "id"))
+        self.assertIsNone(cache.get("ossbat/obats", "id"))
+        cache.invalidate("ossweather/weathers", "id")
+        self.assertIsNone(cache.get("ossweather/weathers", "id"))
+
+    def test_records_expire(self):
+        cache = RecordCache(ttl=0.05)
+        cache.set("ossweather/weathers", "id", object())
+        time.sleep(0.1)
+        self.assertIsNone(cache.get("ossweather/weathers", "id"))
+
+    def test_expired_records_are_pruned(self):
+        cache = RecordCache(ttl=0.05)
+        cache.set("ossweather/weathers", "a", object())
+        cache.set("ossweather/weathers", "b", object())
+        time.sleep(0.1)
+        cache.set("ossweather/weathers", "c", object())
+        self.assertEqual([("ossweather/weathers", "c")], list(cache._records))
+
+    def test_disabled_by_default(self):
+        cache = RecordCache()
+        cache.set("ossweather/weathers", "id", object())
+        self.assertIsNone(cache.get("ossweather/weathers", "id"))
+
+    def test_detail_actions_invalidate(self):
+        client = FakeClient(record_cache_ttl=60)
+        weather = BaseEndpoint(client, "ossweather/weathers").data_to_record(dict(id="id"))
+        client.record_cache.set("ossweather/weathers", "id", weather)
+        weather.detail_action("weather_series")
+        self.assertIs(weather, client.record_cache.get("ossweather/weathers", "id"))
+        weather.detail_action("import_data", method="PATCH")
+        self.assertIsNone(client.record_cache.get("ossweather/weathers", "id"))
@@ -0,0 +1,205 @@
+import base64
+import datetime as dt
+import io
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import urlparse, parse_qs
+
+from oplusclient.exceptions import HttpServerError
+from oplusclient.rest_client import RestClient
+from oplusclient.retry import RetryPolicy
+
+
+def _b64(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("utf-8")
+
+
+def make_token(lifetime=3600):
+    payload = json.dumps(dict(exp=int(time.time()) + lifetime)).encode("utf-8")
+    return f"{_b64(b'{}')}.{_b64(payload)}.signature"
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class _BlobStandInHandler(BaseHTTPRequestHandler):
+    """
+    Minimal stand-in for the token endpoint and the blob storage (put blob, put block and put block list).
+    """
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status_code, body=b""):
+        self.send_response(status_code)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self):
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def _send_failure(self):
+        failures = self.server.failures.get(urlparse(self.path).path)
+        if not failures:
+            return False
+        self.send_response(failures.pop(0))
+        self.send_header("Retry-After", "0")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+        return True
+
+    def do_POST(self):
+        self._read_body()
+        if self.path.endswith("/oteams/token/refresh"):
+            self.server.token_refreshes += 1
+            time.sleep(0.05)
+            self._send(200, json.dumps(dict(access=make_token())).encode("utf-8"))
+        elif not self._send_failure():
+            self._send(201, b"{}")
+
+    def do_GET(self):
+        if self._send_failure():
+            return
+        path = urlparse(self.path).path
+        if path in self.server.blobs:
+            self._send(200, self.server.blobs[path])
+        else:
+            self._send(404)
+
+    def do_PUT(self):
+        body = self._read_body()
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        self.server.put_requests.append(query.get("comp", [None])[0])
+        failures = self.server.block_failures
+        if query.get("comp") == ["block"]:
+            block_id = query["blockid"][0]
+            if failures.get(block_id, 0) > 0:
+                failures[block_id] -= 1
+                self._send(503)
+                return
+            self.server.blocks.setdefault(url.path, {})[block_id] = body
+        elif query.get("comp") == ["blocklist"]:
+            blocks = self.server.blocks.pop(url.path)
+            block_ids = re.findall(r"<Latest>(.*?)</Latest>", body.decode("utf-8"))
+            self.server.blobs[url.path] = b"".join(blocks[block_id] for block_id in block_ids)
+        else:
+            self.server.blobs[url.path] = body
+        self._send(201)
+
+
+class TestRestClient(unittest.TestCase):
+    def setUp(self):
+        self.server = _ThreadingHTTPServer(("127.0.0.1", 0), _BlobStandInHandler)
+        self.server.blobs = {}
+        self.server.blocks = {}
+        self.server.block_failures = {}
+        self.server.failures = {}
+        self.server.put_requests = []
+        self.server.token_refreshes = 0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.rest_client = RestClient(
+            api_token=make_token(),
+            base_url=self.base_url,
+            retry_policy=RetryPolicy(backoff_factor=0.01)
+        )
+
+    def tearDown(self):
+        self.rest_client.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_upload_small_content_in_one_request(self):
+        self.rest_client.upload(f"{self.base_url}/container/small?sig=token", io.BytesIO(b"content"))
+        self.assertEqual(b"content", self.server.blobs["/container/small"])
+        self.assertEqual([None], self.server.put_requests)
+
+    def test_upload_by_blocks(self):
+        content = os.urandom(10 * 1000 + 7)
+        self.rest_client.upload(
+            f"{self.base_url}/container/big?sig=token",
+            io.BytesIO(content),
+            block_size=1000,
+            max_workers=3
+        )
+        self.assertEqual(content, self.server.blobs["/container/big"])
+        self.assertEqual(11, self.server.put_requests.count("block"))
+        self.assertEqual("blocklist", self.server.put_requests[-1])
+
+    def test_upload_by_blocks_from_path(self):
+        content = os.urandom(2500)
+        path = os.path.join(os.path.dirname(__file__), "_upload.bin")
+        with open(path, "wb") as f:
+            f.write(content)
+        try:
+            self.rest_client.upload(f"{self.base_url}/container/file?sig=token", path, block_size=1000)
+        finally:
+            os.remove(path)
+        self.assertEqual(content, self.server.blobs["/container/file"])
+
+    def test_upload_block_is_retried(self):
+        content = os.urandom(3000)
+        self.server.block_failures[base64.b64encode(b"00000001").decode("utf-8")] = 1
+        self.rest_client.upload(f"{self.base_url}/container/retried?sig=token", io.BytesIO(content), block_size=1000)
+        self.assertEqual(content, self.server.blobs["/container/retried"])
+        self.assertEqual(4, self.server.put_requests.count("block"))
+
+    def test_download_to_buffer(self):
+        self.server.blobs["/container/download"] = b"x" * 5000
+        buffer = io.BytesIO()
+        transferred = self.rest_client.download(
+            f"{self.base_url}/container/download?sig=token",
+            buffer_or_path=buffer,
+            chunk_size=1000
+        )
+        self.assertEqual(5000, transferred)
+        self.assertEqual(b"x" * 5000, buffer.getvalue())
+
+    def test_get_is_retried(self):
+        self.server.blobs["/records"] = b'{"data": []}'
+        self.server.failures["/records"] = [503, 429]
+        self.assertEqual(dict(data=[]), self.rest_client.list("records"))
+        self.assertEqual(2, self.rest_client.retry_count)
+
+    def test_get_retries_are_limited(self):
+        self.server.failures["/records"] = [503] * 5
+        with self.assertRaises(HttpServerError):
+            self.rest_client.list("records")
+        self.assertEqual(4, self.rest_client.retry_count)
+
+    def test_post_is_not_retried(self):
+        self.server.failures["/records"] = [503]
+        with self.assertRaises(HttpServerError):
+            self.rest_client.create("records", dict(name="record"))
+        self.assertEqual(0, self.rest_client.retry_count)
+
+    def test_access_token_is_refreshed_once_by_concurrent_requests(self):
+        self.server.blobs["/records"] = b'{"data": []}'
+        self.assertEqual(1, self.server.token_refreshes)
+        self.rest_client._auth._access_token_exp = dt.datetime.utcnow()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for _ in executor.map(lambda i: self.rest_client.list("records"), range(16)):
+                pass
+        self.assertEqual(2, self.server.token_refreshes)
+
+    def test_access_token_is_reused_from_cache(self):
+        with tempfile.TemporaryDirectory() as dir_path:
+            token_cache_path = os.path.join(dir_path, "token_cache.json")
+            api_token = make_token()
+            for _ in range(3):
+                RestClient(api_token=api_token, base_url=self.base_url, token_cache_path=token_cache_path).close()
+            self.assertEqual(2, self.server.token_refreshes)
+            RestClient(api_token=make_token(lifetime=7200), base_url=self.base_url, token_cache_path=token_cache_path)
+            self.assertEqual(3, self.server.token_refreshes)
@@ -0,0 +1,119 @@
+import io
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from oplusclient.endpoints.base import BaseEndpoint
+from oplusclient.models import Simulation
+from oplusclient.result_cache import ResultCache, pyarrow
+from tests.fakes import FakeClient, FakeRestClient
+
+SIMULATIONS_ROUTE = "osssimulations/simulation_groups/group/simulations"
+SIMULATION_DATA = dict(id="id", status="success", logs="simulation started\nsimulation finished\n")
+
+
+class ResultCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = ResultCache(self.temp_dir.name, max_size=2500)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_frame(self):
+        df = pd.DataFrame(
+            dict(a=[1., 2.]),
+            index=pd.to_datetime(["2019-01-01 00:00:00", "2019-01-01 01:00:00"])
+        )
+        key = self.cache.get_key("simulation", "out_hourly", "success")
+        self.assertIsNone(self.cache.get_frame(key))
+        self.cache.set_frame(key, df)
+        pd.testing.assert_frame_equal(self.cache.get_frame(key), df)
+
+    def test_frame_with_strings_and_missing_values(self):
+        df = pd.DataFrame({"zone": ["a", np.nan, "c"], "value": [1, 2, 3], 0: [True, False, True]})
+        self.cache.set_frame("key", df)
+        pd.testing.assert_frame_equal(self.cache.get_frame("key"), df)
+
+    @unittest.skipIf(pyarrow is not None, "frames are stored as parquet")
+    def test_frame_is_not_pickled(self):
+        self.cache.set_frame("key", pd.DataFrame(dict(a=[1., 2.])))
+        self.assertEqual(["key.npz"], os.listdir(self.cache.cache_dir))
+        # objects would require pickle: frame is not cached
+        self.cache.set_frame("objects", pd.DataFrame(dict(a=[dict(x=1), None])))
+        self.assertIsNone(self.cache.get_frame("objects"))
+
+    def test_cache_dir_is_private(self):
+        cache = ResultCache(os.path.join(self.temp_dir.name, "private"))
+        self.assertEqual(0o700, os.stat(cache.cache_dir).st_mode & 0o777)
+
+    def test_projected_simulation_key_has_version(self):
+        client = FakeClient(
+            FakeRestClient(records={SIMULATIONS_ROUTE: [dict(SIMULATION_DATA)]}),
+            result_cache=self.cache
+        )
+        endpoint = BaseEndpoint(client, SIMULATIONS_ROUTE, Simulation)
+        full_key = endpoint.data_to_record(dict(SIMULATION_DATA))._get_cache_key("out_envelope")
+        simulation = endpoint.data_to_record(dict(id="id", status="success"), partial=True)
+        self.assertEqual(full_key, simulation._get_cache_key("out_envelope"))
+        self.assertEqual(1, client.rest_client.count("retrieve"))
+        # another run has another key
+        self.assertNotEqual(
+            full_key,
+            endpoint.data_to_record(dict(SIMULATION_DATA, logs="simulation restarted\n"))._get_cache_key("out_envelope")
+        )
+
+    def test_simulation_without_version_is_not_cached(self):
+        data = dict(id="id", status="success")
+        client = FakeClient(FakeRestClient(records={SIMULATIONS_ROUTE: [dict(data)]}), result_cache=self.cache)
+        endpoint = BaseEndpoint(client, SIMULATIONS_ROUTE, Simulation)
+        self.assertIsNone(endpoint.data_to_record(dict(data))._get_cache_key("out_envelope"))
+        self.assertIsNone(endpoint.data_to_record(dict(data, logs=""))._get_cache_key("out_envelope"))
+        self.assertIsNone(endpoint.data_to_record(dict(data), partial=True)._get_cache_key("out_envelope"))
+        self.assertEqual(1, client.rest_client.count("retrieve"))
+
+    def test_bytes(self):
+        self.cache.set_bytes("key", b"content")
+        self.assertEqual(b"content", self.cache.get_bytes("key"))
+        buffer = io.BytesIO()
+        self.assertEqual(7, self.cache.get_bytes("key", buffer_or_path=buffer))
+        self.assertEqual(b"content", buffer.getvalue())
+
+    def test_least_recently_used_are_evicted(self):
+        self.cache.set_bytes("a", b"x" * 1000)
+        self.cache.set_bytes("b", b"x" * 1000)
+        # a is used, so b is the least recently used
+        os.utime(self.cache._get_path("b", ".bin"), (0, 0))
+        self.cache.get_bytes("a")
+        self.cache.set_bytes("c", b"x" * 1000)
+        self.assertIsNone(self.cache.get_bytes("b"))
+        self.assertIsNotNone(self.cache.get_bytes("a"))
+        self.assertIsNotNone(self.cache.get_bytes("c"))
+
+    def test_too_big_entries_are_not_stored(self):
+        self.cache.set_bytes("a", b"x" * 3000)
+        self.assertIsNone(self.cache.get_bytes("a"))
+        self.assertEqual([], os.listdir(self.cache.cache_dir))
+
+    def test_eplus_output_is_downloaded_once(self):
+        rest_client = FakeRestClient(records={SIMULATIONS_ROUTE: [dict(SIMULATION_DATA)]})
+        rest_client.detail_actions["eplus_output"] = dict(blob_url="https://blobs/eplus_output.zip?sig=token")
+        simulation = BaseEndpoint(
+            FakeClient(rest_client, result_cache=self.cache),
+            SIMULATIONS_ROUTE,
+            Simulation
+        ).retrieve("id")
+        for size in (3000, 1000):  # too big to be stored, then stored
+            rest_client.blobs["/eplus_output.zip"] = b"x" * size
+            self.cache.clear()
+            downloads_nb = rest_client.count("download")
+            buffer = io.BytesIO()
+            self.assertEqual(size, simulation.download_eplus_output(buffer_or_path=buffer))
+            self.assertEqual(b"x" * size, buffer.getvalue())
+            self.assertEqual(downloads_nb + 1, rest_client.count("download"))
+            # stored output is not downloaded again
+            self.assertEqual(b"x" * size, simulation.download_eplus_output())
+            self.assertEqual(downloads_nb + (2 if size > self.cache.max_size else 1), rest_client.count("download"))
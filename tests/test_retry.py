@@ -0,0 +1,15 @@
+import unittest
+
+from oplusclient.retry import RetryPolicy
+
+
+class RetryPolicyTest(unittest.TestCase):
+    def test_retry_after(self):
+        policy = RetryPolicy(max_backoff=1, max_retry_after=60, jitter=False)
+        self.assertEqual(0.5, policy.get_delay(1))
+        self.assertEqual(1, policy.get_delay(5))
+        # server delay prevails over backoff, up to max_retry_after
+        self.assertEqual(10, policy.get_delay(1, headers={"Retry-After": "10"}))
+        self.assertEqual(60, policy.get_delay(1, headers={"Retry-After": "86400"}))
+        self.assertEqual(60, policy.get_delay(1, headers={"Retry-After": "Fri, 31 Dec 2100 23:59:59 GMT"}))
+        self.assertEqual(0.5, policy.get_delay(1, headers={"Retry-After": "invalid"}))
@@ -0,0 +1,169 @@
+import json
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from oplusclient import exceptions
+from oplusclient.endpoints.base import BaseEndpoint
+from oplusclient.models import SimulationGroup, MultiSimulationGroup
+from oplusclient.models.simulation_group import _reload_simulation_groups
+from tests.fakes import FakeClient, FakeRestClient
+
+ROUTE = "osssimulations/simulation_groups"
+SIMULATIONS_ROUTE = f"{ROUTE}/group/simulations"
+
+
+def _get_simulation_group(name_filter, model_cls=SimulationGroup):
+    rest_client = FakeRestClient(
+        records={
+            ROUTE: [dict(id="group", name="group")],
+            SIMULATIONS_ROUTE: [dict(id=f"s{i}", name=f"simulation {i}", status="pending") for i in range(3)]
+        },
+        filters=("name",) if name_filter else (),
+        marker_page_size=100
+    )
+
+    def add_simulation(path, record_id, method, data, params):
+        # payload must be json serializable, as for requests
+        simulations = rest_client.records[SIMULATIONS_ROUTE]
+        simulation = dict(json.loads(json.dumps(data)), id=f"s{len(simulations)}")
+        simulations.append(simulation)
+        return simulation
+
+    rest_client.detail_actions["add_simulation"] = add_simulation
+    client = FakeClient(rest_client)
+    return BaseEndpoint(client, ROUTE, model_cls).retrieve("group"), client
+
+
+class SimulationGroupTest(unittest.TestCase):
+    def test_get_simulation_by_name_with_server_filter(self):
+        simulation_group, client = _get_simulation_group(name_filter=True)
+        self.assertEqual("s1", simulation_group.get_simulation_by_name("simulation 1").id)
+        self.assertEqual("s2", simulation_group.get_simulation_by_name("simulation 2").id)
+        self.assertEqual(2, client.rest_client.count("list"))
+        # only the probe is projected, its simulation is retrieved
+        self.assertEqual(1, client.rest_client.count("retrieve", "s1"))
+        self.assertEqual(0, client.rest_client.count("retrieve", "s2"))
+        self.assertIsNone(simulation_group._simulation_ids_by_name)
+        with self.assertRaises(exceptions.RecordNotFoundError):
+            simulation_group.get_simulation_by_name("unknown")
+
+    def test_get_simulation_by_name_probe_is_projected(self):
+        simulation_group, client = _get_simulation_group(name_filter=False)
+        client.rest_client.records[SIMULATIONS_ROUTE][1]["logs"] = "simulation finished\n"
+        listed_fields = []
+        list_ = client.rest_client.list
+
+        def list_with_fields(path, params=None, fields=None, exclude=None):
+            listed_fields.append(fields)
+            return list_(path, params=params, fields=fields, exclude=exclude)
+
+        client.rest_client.list = list_with_fields
+        simulation = simulation_group.get_simulation_by_name("simulation 1")
+        self.assertEqual([["id", "name"]] * 2, [sorted(fields) for fields in listed_fields])
+        self.assertEqual("simulation finished\n", simulation.data["logs"])
+
+    def test_get_simulation_by_name_with_deleted_simulation(self):
+        simulation_group, client = _get_simulation_group(name_filter=False)
+        simulation_group.get_simulation_by_name("simulation 1")
+        client.rest_client.delete(SIMULATIONS_ROUTE, "s1")
+        with self.assertRaises(exceptions.RecordNotFoundError):
+            simulation_group.get_simulation_by_name("simulation 1")
+        self.assertNotIn("simulation 1", simulation_group._simulation_ids_by_name)
+        self.assertEqual("s2", simulation_group.get_simulation_by_name("simulation 2").id)
+
+    def test_get_simulation_by_name_with_index(self):
+        simulation_group, client = _get_simulation_group(name_filter=False)
+        self.assertEqual("s1", simulation_group.get_simulation_by_name("simulation 1").id)
+        # index is reused, simulations are retrieved at each lookup (up to date)
+        client.rest_client.records[SIMULATIONS_ROUTE][2]["status"] = "success"
+        self.assertEqual("success", simulation_group.get_simulation_by_name("simulation 2").status)
+        self.assertEqual(2, client.rest_client.count("list"))
+        self.assertEqual(2, client.rest_client.count("retrieve", "s1") + client.rest_client.count("retrieve", "s2"))
+        with self.assertRaises(exceptions.RecordNotFoundError):
+            simulation_group.get_simulation_by_name("unknown")
+
+    def test_index_is_cleared_on_reload(self):
+        simulation_group, client = _get_simulation_group(name_filter=False)
+        simulation_group.get_simulation_by_name("simulation 1")
+        client.rest_client.records[SIMULATIONS_ROUTE].append(dict(id="s3", name="simulation 3", status="pending"))
+        simulation_group.reload()
+        self.assertEqual("s3", simulation_group.get_simulation_by_name("simulation 3").id)
+
+    def test_batch_reload_clears_index_and_record_cache(self):
+        simulation_group, client = _get_simulation_group(name_filter=False)
+        rest_client = client.rest_client
+        rest_client.records[ROUTE][0]["project"] = "project"
+        rest_client.records[ROUTE].append(dict(id="other", name="other", project="project"))
+        endpoint = BaseEndpoint(client, ROUTE, SimulationGroup)
+        simulation_groups = [endpoint.retrieve("group"), endpoint.retrieve("other")]
+        simulation_groups[0].get_simulation_by_name("simulation 1")
+        client.record_cache.ttl = 60
+        client.record_cache.set(ROUTE, "group", simulation_group)
+        self.assertIs(simulation_group, client.record_cache.get(ROUTE, "group"))
+        rest_client.records[SIMULATIONS_ROUTE].append(dict(id="s3", name="simulation 3", status="pending"))
+        retrieves_nb = rest_client.count("retrieve")
+        _reload_simulation_groups(simulation_groups)
+        # reloaded by one list request
+        self.assertEqual(retrieves_nb, rest_client.count("retrieve"))
+        self.assertIsNone(client.record_cache.get(ROUTE, "group"))
+        self.assertEqual("s3", simulation_groups[0].get_simulation_by_name("simulation 3").id)
+
+    def test_get_simulations_by_names(self):
+        simulation_group, client = _get_simulation_group(name_filter=False)
+        simulations = simulation_group.get_simulations_by_names(["simulation 2", "simulation 0"])
+        self.assertEqual(["s2", "s0"], [s.id for s in simulations])
+        with self.assertRaises(exceptions.RecordNotFoundError):
+            simulation_group.get_simulations_by_names(["simulation 0", "unknown"])
+
+    def test_add_simulations_with_numpy_values(self):
+        simulation_group, client = _get_simulation_group(name_filter=False, model_cls=MultiSimulationGroup)
+        self.assertFalse(hasattr(SimulationGroup, "add_simulations"))
+        specs = pd.DataFrame(dict(
+            name=["a", "b"],
+            weather="w",
+            geometry="g",
+            obat="o",
+            start="2019-01-01",
+            end="2019-12-31",
+            outputs_report=np.array([True, False])
+        ))
+        specs_list = specs.to_dict("records")
+        specs_list[1]["outputs_report"] = np.bool_(True)
+        specs_list[1]["variant"] = np.int64(2)
+        simulations = simulation_group.add_simulations(specs) + simulation_group.add_simulations(specs_list)
+        self.assertEqual([True, False, True, True], [s.outputs_report for s in simulations])
+        self.assertEqual(2, simulations[-1].variant)
+
+    def test_collect_results_keeps_collected_results_on_errors(self):
+        simulation_group, client = _get_simulation_group(name_filter=False)
+        rest_client = client.rest_client
+        rest_client.filters.add("status")
+        for simulation in rest_client.records[SIMULATIONS_ROUTE][:2]:
+            simulation.update(status="success", logs="simulation finished\n")
+        rest_client.detail_actions["out_envelope"] = lambda path, record_id, *_: dict(
+            blob_url=f"https://blobs/{record_id}/out_envelope.csv"
+        )
+        rest_client.blobs["/s0/out_envelope.csv"] = b"a,b\n1,2\n"
+        listed_fields = []
+        list_ = rest_client.list
+
+        def list_with_fields(path, params=None, fields=None, exclude=None):
+            listed_fields.append(fields)
+            return list_(path, params=params, fields=fields, exclude=exclude)
+
+        rest_client.list = list_with_fields
+        with self.assertRaises(exceptions.BatchError) as cm:
+            simulation_group.collect_results("out_envelope")
+        self.assertEqual([1], list(cm.exception.errors))
+        self.assertEqual(404, cm.exception.errors[1].status_code)
+        self.assertEqual([1], cm.exception.results[0]["a"].tolist())
+        self.assertIsNone(cm.exception.results[1])
+        # successful simulations are listed without logs
+        self.assertEqual(["success"], [r[2]["status"] for r in rest_client.requests if r[0] == "list"])
+        self.assertEqual(["id", "name", "status"], sorted(listed_fields[0]))
+
+        rest_client.blobs["/s1/out_envelope.csv"] = b"a,b\n3,4\n"
+        df = simulation_group.collect_results("out_envelope")
+        self.assertEqual([("s0", "simulation 0", 0), ("s1", "simulation 1", 0)], df.index.tolist())
@@ -0,0 +1,73 @@
+import unittest
+
+from oplusclient import exceptions
+from oplusclient.endpoints.base import BaseEndpoint
+from oplusclient.models import Simulation
+from tests.fakes import FakeClient, FakeRestClient
+
+SIMULATIONS_ROUTE = "osssimulations/simulation_groups/group/simulations"
+
+
+class _LogsRestClient(FakeRestClient):
+    def __init__(self, states, logs_offset=False):
+        """
+        Parameters
+        ----------
+        states: list of (str, str)
+            (status, logs) of the simulation at each retrieve, the last one is kept
+        logs_offset: bool
+            if True, the logs_offset parameter is supported (only the logs end is sent, and the offset is echoed)
+        """
+        super().__init__(records={SIMULATIONS_ROUTE: [dict(id="id", status="running", logs="")]})
+        self.states = list(states)
+        self.logs_offset = logs_offset
+        self.retrieve_params = []
+
+    def retrieve(self, path, record_id, params=None, fields=None, exclude=None):
+        self.retrieve_params.append(params)
+        status, logs = self.states.pop(0) if len(self.states) > 1 else self.states[0]
+        self.records[path][0].update(status=status, logs=logs)
+        data = super().retrieve(path, record_id, fields=fields, exclude=exclude)
+        offset = (params or dict()).get("logs_offset")
+        if self.logs_offset and offset is not None:
+            data.update(logs=logs[offset:], logs_offset=offset)
+        return data
+
+
+def _get_simulation(rest_client):
+    return BaseEndpoint(FakeClient(rest_client), SIMULATIONS_ROUTE, Simulation).data_to_record(
+        dict(id="id", status="running", logs="")
+    )
+
+
+class SimulationLogsTest(unittest.TestCase):
+    def test_logs_are_rebuilt_from_offset(self):
+        rest_client = _LogsRestClient(
+            [("running", "a\nb"), ("running", "a\nbc\n"), ("success", "a\nbc\nd\n")],
+            logs_offset=True
+        )
+        simulation = _get_simulation(rest_client)
+        self.assertEqual(["a", "bc", "d"], list(simulation.iter_logs(reload_freq=0.01)))
+        self.assertEqual([None, dict(logs_offset=3), dict(logs_offset=5)], rest_client.retrieve_params)
+        self.assertEqual("a\nbc\nd\n", simulation.logs)
+
+    def test_incomplete_line_is_held_back(self):
+        rest_client = _LogsRestClient([("running", "a\nb"), ("running", "a\nbc"), ("success", "a\nbcd")])
+        lines = []
+        for line in _get_simulation(rest_client).iter_logs(reload_freq=0.01):
+            lines.append((line, len(rest_client.retrieve_params)))
+        # incomplete line is yielded once the simulation is finished
+        self.assertEqual([("a", 1), ("bcd", 3)], lines)
+
+    def test_logs_are_reset_when_they_shrink(self):
+        rest_client = _LogsRestClient([("running", "a\nb\n"), ("running", "c\n"), ("success", "c\nd\n")])
+        self.assertEqual(["a", "b", "c", "d"], list(_get_simulation(rest_client).iter_logs(reload_freq=0.01)))
+
+    def test_timeout(self):
+        rest_client = _LogsRestClient([("running", "a\n")])
+        simulation = _get_simulation(rest_client)
+        lines = []
+        with self.assertRaises(exceptions.TaskTimeoutError):
+            simulation.wait_for_completion(reload_freq=0.01, on_log=lines.append, timeout=0.05)
+        self.assertEqual(["a"], lines)
+        self.assertGreater(len(rest_client.retrieve_params), 1)